@@ -5,36 +5,137 @@ Interactive web interface for ocean sustainability queries using RAG system.
 """
 
 import streamlit as st
-import argparse
 import sys
 import os
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple, Generator
 import time
 import tempfile
 from pathlib import Path
 
-# Add the current directory to Python path for imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from ocean_ai.query_cache import QueryCache
 
-from rag_retriever import OceanRAGRetriever
-from ingest import DocumentIngestor
+if TYPE_CHECKING:
+    # Imported lazily by the factories below; openai, psycopg2 and langchain are slow to import
+    from ocean_ai.rag_retriever import OceanRAGRetriever, QueryProcessor
+    from ingest import DocumentIngestor
+
+EXAMPLE_QUESTIONS = [
+    "What are seagrass restoration methods?",
+    "What is the success rate of transplantation methods in the Baltic Sea?",
+    "List recent seagrass restoration methods in the Baltic Sea.",
+    "How effective is seed broadcasting for seagrass restoration?",
+    "What are the carbon sequestration benefits of seagrass meadows?",
+    "What monitoring techniques are used in seagrass restoration?"
+]
 
 def init_session_state():
     """Initialize Streamlit session state variables"""
-    if 'retriever' not in st.session_state:
-        st.session_state.retriever = None
-    if 'ingestor' not in st.session_state:
-        st.session_state.ingestor = None
     if 'query_history' not in st.session_state:
         st.session_state.query_history = []
     if 'config_loaded' not in st.session_state:
         st.session_state.config_loaded = False
 
+@st.cache_resource
+def get_retriever(config_path: str) -> "OceanRAGRetriever":
+    """Return the RAG retriever shared by all sessions for this config"""
+    from ocean_ai.rag_retriever import OceanRAGRetriever
+    return OceanRAGRetriever(config_path)
+
+@st.cache_resource
+def get_ingestor(config_path: str) -> "DocumentIngestor":
+    """Return the document ingestor shared by all sessions for this config"""
+    from ingest import DocumentIngestor
+    return DocumentIngestor(config_path)
+
+@st.cache_resource
+def get_query_processor(config_path: str) -> "QueryProcessor":
+    """Return the query processor that batches retrieval across all sessions"""
+    from ocean_ai.rag_retriever import QueryProcessor
+    return QueryProcessor(get_retriever(config_path))
+
+@st.cache_resource
+def get_db_pool(config_path: str):
+    """Return the PostgreSQL connection pool for this config, shared by all sessions"""
+    from ocean_ai.db import get_pool
+    return get_pool(config_path)
+
+@st.cache_data(ttl=60)
+def get_schema_health(config_path: str) -> Dict[str, Any]:
+    """Return the database schema checks, re-run at most once a minute"""
+    from check_db import fetch_schema_health
+    from ocean_ai.db import cursor
+    
+    with cursor(pool=get_db_pool(config_path)) as cur:
+        return fetch_schema_health(cur)
+
+@st.cache_resource
+def get_query_cache(config_path: str) -> QueryCache:
+    """Return the query result cache shared by all sessions for this config"""
+    cache = QueryCache()
+    
+    # Embed the example questions up front (one API call) so clicking one skips that step
+    retriever = get_retriever(config_path)
+    if retriever.config.get('cache', {}).get('prewarm_examples', True):
+        embeddings = retriever.create_query_embeddings(EXAMPLE_QUESTIONS)
+        for question, embedding in zip(EXAMPLE_QUESTIONS, embeddings):
+            cache.pin_embedding(question, embedding)
+    
+    return cache
+
+def cached_query_stream(config_path: str, question: str,
+                        **params) -> Generator[str, None, Tuple[Dict[str, Any], str]]:
+    """
+    Run a query through the result cache, falling back to the streaming RAG pipeline
+    
+    Yields:
+        The answer text; a cached answer arrives in one piece, a fresh one token by token
+    
+    Returns:
+        The query result and the cache status ("exact hit", "semantic hit" or "miss")
+    """
+    cache = get_query_cache(config_path)
+    scope = QueryCache.make_scope(**params)
+    key = QueryCache.make_key(question, scope)
+    
+    result = cache.get(key)
+    if result is not None:
+        yield result['answer']
+        return result, "exact hit"
+    
+    query_embedding = cache.get_embedding(question)
+    if query_embedding is None:
+        query_embedding = get_retriever(config_path).create_query_embedding(question)
+    if query_embedding is not None:
+        result = cache.get_similar(query_embedding, scope)
+        if result is not None:
+            yield result['answer']
+            return result, "semantic hit"
+    
+    processor = get_query_processor(config_path)
+    result = yield from processor.query_stream(question=question, query_embedding=query_embedding, **params)
+    # Failures (no metadata at all, or an error flagged by search/generation) are not cached
+    if result['metadata'] and not result['metadata'].get('error'):
+        cache.put(key, result, scope, embedding=query_embedding)
+    return result, "miss"
+
+def write_stream_result(stream: Generator) -> Any:
+    """Write a text stream to the page and return the generator's return value"""
+    captured = {}
+    
+    def forward():
+        # yield from hands back the StopIteration value that st.write_stream discards
+        captured['value'] = yield from stream
+    
+    st.write_stream(forward())
+    return captured['value']
+
 def load_retriever(config_path: str) -> bool:
     """Load the RAG retriever with error handling"""
     try:
-        st.session_state.retriever = OceanRAGRetriever(config_path)
-        st.session_state.ingestor = DocumentIngestor(config_path)
+        get_retriever(config_path)
+        get_ingestor(config_path)
+        get_query_cache(config_path)
+        st.session_state.config_path = config_path
         st.session_state.config_loaded = True
         return True
     except Exception as e:
@@ -63,15 +164,42 @@ def format_sources(sources: list) -> str:
     
     return "\n".join(formatted)
 
-def display_query_result(result: Dict[str, Any]):
-    """Display the query result in a formatted way"""
+def render_result_markdown(result: Dict[str, Any], cache_status: Optional[str] = None) -> str:
+    """Render a query result as a single markdown string for compact history display"""
+    stats = [
+        f"Results Found: {result['metadata'].get('results_count', 0)}",
+        f"Sources Used: {len(result['sources'])}"
+    ]
+    if result['metadata'].get('model_usage'):
+        stats.append(f"Tokens Used: {result['metadata']['model_usage'].get('total_tokens', 'N/A')}")
+    if cache_status:
+        stats.append(f"Cache: {cache_status}")
+    
+    return "\n\n".join([
+        "### 🌊 Answer",
+        result['answer'],
+        f"*{' · '.join(stats)}*",
+        f"#### 📚 Sources ({len(result['sources'])})",
+        format_sources(result['sources'])
+    ])
+
+def display_query_result(result: Dict[str, Any], cache_status: Optional[str] = None, key: str = "latest",
+                         show_answer: bool = True):
+    """
+    Display the query result in a formatted way
+    
+    Args:
+        key: Stable identifier for this rendering, used to key its widgets across reruns
+        show_answer: Render the answer text (False when it has already been streamed)
+    """
     
     # Main answer
-    st.markdown("### 🌊 Answer")
-    st.markdown(result['answer'])
+    if show_answer:
+        st.markdown("### 🌊 Answer")
+        st.markdown(result['answer'])
     
     # Metadata
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric("Results Found", result['metadata']['results_count'])
     with col2:
@@ -80,6 +208,9 @@ def display_query_result(result: Dict[str, Any]):
         if 'model_usage' in result['metadata'] and result['metadata']['model_usage']:
             tokens = result['metadata']['model_usage'].get('total_tokens', 'N/A')
             st.metric("Tokens Used", tokens)
+    with col4:
+        if cache_status:
+            st.metric("Cache", cache_status)
     
     # Sources
     if result['sources']:
@@ -87,10 +218,25 @@ def display_query_result(result: Dict[str, Any]):
             st.markdown(format_sources(result['sources']))
     
     # Context (for debugging/transparency)
-    if st.checkbox("Show Context (Debug)", key=f"context_{time.time()}"):
+    if st.checkbox("Show Context (Debug)", key=f"context_{key}"):
         with st.expander("🔍 Retrieved Context"):
             st.text(result['context'])
 
+def display_schema_health(config_path: str):
+    """Show a one-line database schema status"""
+    from check_db import schema_problems
+    
+    try:
+        problems = schema_problems(get_schema_health(config_path))
+    except Exception as e:
+        st.warning(f"⚠️ Could not check DB schema: {e}")
+        return
+    
+    if problems:
+        st.warning(f"⚠️ {', '.join(problems)} (run python database_setup.py)")
+    else:
+        st.success("✅ DB schema OK")
+
 def upload_interface():
     """Document upload interface"""
     st.header("📁 Upload Documents")
@@ -120,6 +266,9 @@ def upload_interface():
             st.error("Please enter an organization name.")
             return
             
+        from ocean_ai.db import cursor
+        
+        ingestor = get_ingestor(st.session_state.config_path)
         progress_bar = st.progress(0)
         status_text = st.empty()
         
@@ -137,11 +286,13 @@ def upload_interface():
             try:
                 # Check if file already exists
                 file_size = len(uploaded_file.getvalue())
-                if st.session_state.ingestor.document_exists(uploaded_file.name, file_size):
+                with cursor(dict_cursor=True, pool=ingestor.pool) as cur:
+                    exists = ingestor.document_exists(cur, uploaded_file.name, file_size)
+                if exists:
                     st.warning(f"⚠️ Document '{uploaded_file.name}' already exists in the database.")
                 else:
                     # Ingest the document with original filename
-                    if st.session_state.ingestor.ingest_document(tmp_file_path, organization, uploaded_file.name):
+                    if ingestor.ingest_document(tmp_file_path, organization, uploaded_file.name):
                         successful_uploads += 1
                         st.success(f"✅ Successfully processed '{uploaded_file.name}'")
                     else:
@@ -201,6 +352,7 @@ def main_interface():
         # Status indicator
         if st.session_state.config_loaded:
             st.success("🟢 Configuration Loaded")
+            display_schema_health(st.session_state.config_path)
         else:
             st.error("🔴 Configuration Not Loaded")
     
@@ -212,6 +364,10 @@ def main_interface():
     with tab2:
         upload_interface()
 
+def _clear_question():
+    """Reset the question box; runs as a callback before the next script run"""
+    st.session_state.current_question = ""
+
 def query_interface():
     """Query interface within the query tab"""
     
@@ -229,7 +385,7 @@ def query_interface():
             index=0
         )
         geographic_filter = st.text_input("Geographic Filter", placeholder="e.g., Baltic Sea")
-        topic_filter = st.text_input("Topic Filter", placeholder="e.g., seagrass")
+        topic_filter = st.text_input("Topic Filter", placeholder="e.g., seagrass_restoration")
         
         # Convert "None" to None
         doc_type_filter = None if doc_type_filter == "None" else doc_type_filter
@@ -247,16 +403,7 @@ def query_interface():
     
     # Example questions
     with st.expander("💡 Example Questions"):
-        example_questions = [
-            "What are seagrass restoration methods?",
-            "What is the success rate of transplantation methods in the Baltic Sea?",
-            "List recent seagrass restoration methods in the Baltic Sea.",
-            "How effective is seed broadcasting for seagrass restoration?",
-            "What are the carbon sequestration benefits of seagrass meadows?",
-            "What monitoring techniques are used in seagrass restoration?"
-        ]
-        
-        for i, question in enumerate(example_questions):
+        for i, question in enumerate(EXAMPLE_QUESTIONS):
             if st.button(f"📋 {question}", key=f"example_{i}"):
                 st.session_state.current_question = question
     
@@ -275,96 +422,63 @@ def query_interface():
             if question and question.strip():
                 with st.spinner("🤔 Thinking..."):
                     try:
-                        result = st.session_state.retriever.query(
-                            question=question,
+                        st.markdown("### 🌊 Answer")
+                        result, cache_status = write_stream_result(cached_query_stream(
+                            st.session_state.config_path,
+                            question,
                             max_results=max_results,
                             similarity_threshold=similarity_threshold,
                             doc_type_filter=doc_type_filter,
                             geographic_filter=geographic_filter,
                             topic_filter=topic_filter
-                        )
+                        ))
                         
                         # Add to history
                         st.session_state.query_history.append({
                             'question': question,
                             'result': result,
+                            'cache_status': cache_status,
+                            'rendered': render_result_markdown(result, cache_status),
                             'timestamp': time.time()
                         })
                         
                         # Display result
-                        display_query_result(result)
+                        display_query_result(result, cache_status, show_answer=False)
                         
                     except Exception as e:
                         st.error(f"❌ Error processing query: {e}")
     
     with col2:
-        if st.button("🗑️ Clear"):
-            st.session_state.current_question = ""
-            st.rerun()
+        st.button("🗑️ Clear", on_click=_clear_question)
     
     # Query history
     if st.session_state.query_history:
         st.header("📜 Query History")
-        for i, entry in enumerate(reversed(st.session_state.query_history[-5:])):  # Show last 5
+        history = st.session_state.query_history
+        for i in range(len(history) - 1, max(len(history) - 6, -1), -1):  # Show last 5, newest first
+            entry = history[i]
             with st.expander(f"Q: {entry['question'][:80]}{'...' if len(entry['question']) > 80 else ''}"):
-                display_query_result(entry['result'])
-
-def command_line_mode():
-    """Handle command line execution mode"""
-    parser = argparse.ArgumentParser(description="Ocean AI POC - Command Line Interface")
-    parser.add_argument("--config", "-c", default="config.yaml", help="Configuration file path")
-    parser.add_argument("--question", "-q", required=True, help="Question to ask")
-    parser.add_argument("--max-results", type=int, default=5, help="Maximum results to retrieve")
-    parser.add_argument("--similarity-threshold", type=float, default=0.4, help="Similarity threshold")
-    parser.add_argument("--doc-type", help="Filter by document type")
-    parser.add_argument("--geographic", help="Filter by geographic region")
-    parser.add_argument("--topic", help="Filter by topic")
-    parser.add_argument("--output-format", choices=["text", "json"], default="text", help="Output format")
-    
-    args = parser.parse_args()
-    
-    try:
-        # Initialize retriever
-        retriever = OceanRAGRetriever(args.config)
-        
-        # Execute query
-        result = retriever.query(
-            question=args.question,
-            max_results=args.max_results,
-            similarity_threshold=args.similarity_threshold,
-            doc_type_filter=args.doc_type,
-            geographic_filter=args.geographic,
-            topic_filter=args.topic
-        )
-        
-        # Output results
-        if args.output_format == "json":
-            import json
-            print(json.dumps(result, indent=2))
-        else:
-            # Text format (similar to rag_retriever.py output)
-            print(f"Question: {result['metadata']['question']}")
-            print(f"\nAnswer: {result['answer']}")
-            print(f"\nSources ({len(result['sources'])}):")
-            for i, source in enumerate(result['sources'], 1):
-                print(f"  {i}. {source['filename']} ({source['organization']}) - Similarity: {source['similarity_score']}")
-            print(f"\nResults found: {result['metadata']['results_count']}")
-    
-    except Exception as e:
-        print(f"Error: {e}")
-        sys.exit(1)
+                # Only the newest entry gets the full widget layout; older ones reuse
+                # the markdown rendered when they were added
+                if i == len(history) - 1:
+                    display_query_result(entry['result'], entry.get('cache_status'), key=f"hist_{i}")
+                else:
+                    st.markdown(entry['rendered'])
 
 def main():
     """Main entry point"""
     # Initialize session state
     init_session_state()
     
-    # Check if running in command line mode
-    if len(sys.argv) > 1 and "--question" in sys.argv:
-        command_line_mode()
-    else:
-        # Run Streamlit interface
-        main_interface()
+    # Run Streamlit interface (the command line interface lives in cli.py)
+    main_interface()
+
+def run():
+    """Console script entry point: serve this app with streamlit run"""
+    from streamlit.web import cli as stcli
+    
+    sys.argv = ["streamlit", "run", os.path.abspath(__file__), *sys.argv[1:]]
+    sys.exit(stcli.main())
 
 if __name__ == "__main__":
     main()
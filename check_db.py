@@ -4,40 +4,74 @@ Simple Database Schema Checker
 Quick check to see if the database tables exist with correct schema.
 """
 
-import yaml
+from typing import Any, Dict, List
+
 import psycopg2
 
+from ocean_ai.db import VECTOR_INDEX_NAMES, cursor
+
+SCHEMA_CHECK_SQL = """
+    SELECT
+        EXISTS (SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'documents' AND column_name = 'doc_type') AS has_doc_type,
+        EXISTS (SELECT 1 FROM information_schema.tables
+                WHERE table_name = 'chunks') AS has_chunks,
+        EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector') AS has_vector,
+        (SELECT udt_name FROM information_schema.columns
+         WHERE table_name = 'chunks' AND column_name = 'embedding') AS embedding_type,
+        EXISTS (SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'chunks' AND column_name = 'content_sha256') AS has_content_sha256,
+        EXISTS (SELECT 1 FROM pg_indexes
+                WHERE tablename = 'documents'
+                  AND indexname = 'idx_documents_filename_file_size') AS has_document_key,
+        (SELECT array_agg(indexname ORDER BY indexname) FROM pg_indexes
+         WHERE tablename = 'chunks' AND indexname = ANY(%s)) AS vector_indexes;
+"""
+
+def fetch_schema_health(cur) -> Dict[str, Any]:
+    """Run all schema checks in one round-trip and return the results by name"""
+    cur.execute(SCHEMA_CHECK_SQL, (list(VECTOR_INDEX_NAMES),))
+    names = [column.name for column in cur.description]
+    return dict(zip(names, cur.fetchone()))
+
+def schema_problems(health: Dict[str, Any]) -> List[str]:
+    """Summarize what is missing from a fetch_schema_health() result"""
+    problems = []
+    if not health['has_doc_type']:
+        problems.append("missing doc_type")
+    if not health['has_chunks']:
+        problems.append("missing chunks table")
+    if not health['has_vector']:
+        problems.append("missing pgvector extension")
+    if health['embedding_type'] not in ('halfvec', 'vector'):
+        problems.append("missing embedding column")
+    if not health['has_content_sha256']:
+        problems.append("missing chunks.content_sha256")
+    if not health['has_document_key']:
+        problems.append("missing unique (filename, file_size) index")
+    if not health['vector_indexes']:
+        problems.append("missing vector index")
+    elif len(health['vector_indexes']) > 1:
+        problems.append("both hnsw and ivfflat vector indexes")
+    return problems
+
 def check_database():
     """Check if database schema is correct"""
     try:
-        # Load config
-        with open('config.yaml', 'r') as f:
-            config = yaml.safe_load(f)
-        
-        db_config = config['postgres']
-        
-        # Connect to database
-        conn = psycopg2.connect(
-            host=db_config['host'],
-            port=db_config['port'],
-            dbname=db_config['dbname'],
-            user=db_config['user'],
-            password=db_config['password'],
-            sslmode=db_config['sslmode']
+        # Borrow a pooled connection (the pool reads config.yaml on first use)
+        with cursor() as cur:
+            print("✅ Database connection successful")
+            
+            # All checks in one round-trip
+            health = fetch_schema_health(cur)
+        has_doc_type, has_chunks, has_vector, embedding_type, vector_indexes = (
+            health['has_doc_type'], health['has_chunks'], health['has_vector'],
+            health['embedding_type'], health['vector_indexes']
         )
-        cursor = conn.cursor()
-        
-        print("✅ Database connection successful")
+        has_content_sha256, has_document_key = health['has_content_sha256'], health['has_document_key']
         
         # Check if documents table exists with doc_type column
-        cursor.execute("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'documents' AND column_name = 'doc_type';
-        """)
-        doc_type_exists = cursor.fetchone()
-        
-        if doc_type_exists:
+        if has_doc_type:
             print("✅ documents table has doc_type column")
         else:
             print("❌ documents table missing doc_type column")
@@ -45,14 +79,7 @@ def check_database():
             return False
         
         # Check if chunks table exists
-        cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_name = 'chunks';
-        """)
-        chunks_exists = cursor.fetchone()
-        
-        if chunks_exists:
+        if has_chunks:
             print("✅ chunks table exists")
         else:
             print("❌ chunks table missing")
@@ -60,18 +87,50 @@ def check_database():
             return False
         
         # Check pgvector extension
-        cursor.execute("SELECT extname FROM pg_extension WHERE extname='vector';")
-        vector_ext = cursor.fetchone()
-        
-        if vector_ext:
+        if has_vector:
             print("✅ pgvector extension installed")
         else:
             print("❌ pgvector extension missing")
             print("   Solution: Run 'python database_setup.py'")
             return False
         
-        cursor.close()
-        conn.close()
+        # Check embedding storage type
+        if embedding_type == 'halfvec':
+            print("✅ chunks.embedding is halfvec")
+        elif embedding_type == 'vector':
+            print("⚠️ chunks.embedding is full-precision vector")
+            print("   Optional: Run 'python migrate_halfvec.py' (needs pgvector 0.7+)")
+        else:
+            print("❌ chunks.embedding column missing or of unexpected type")
+            print("   Solution: Run 'python reset_db.py'")
+            return False
+        
+        # Check the columns and indexes ingestion relies on
+        if has_content_sha256:
+            print("✅ chunks table has content_sha256 column")
+        else:
+            print("❌ chunks table missing content_sha256 column")
+            print("   Solution: Run 'python database_setup.py'")
+            return False
+        
+        if has_document_key:
+            print("✅ documents has unique (filename, file_size) index")
+        else:
+            print("❌ documents missing unique (filename, file_size) index (ingest's ON CONFLICT needs it)")
+            print("   Solution: Run 'python database_setup.py' (remove duplicate documents first if it fails)")
+            return False
+        
+        # Check vector index (hnsw, or ivfflat on older pgvector)
+        if vector_indexes and len(vector_indexes) > 1:
+            print(f"❌ both {' and '.join(vector_indexes)} exist; the planner may pick the ivfflat one")
+            print("   Solution: Run 'python database_setup.py'")
+            return False
+        elif vector_indexes:
+            print(f"✅ vector index {vector_indexes[0]} exists")
+        else:
+            print("❌ vector index on chunks.embedding missing")
+            print("   Solution: Run 'python database_setup.py'")
+            return False
         
         print("🎉 Database schema is correct!")
         return True
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Ocean AI POC - Command Line Interface
+Query the ocean sustainability RAG system from the terminal, without loading Streamlit.
+"""
+
+import argparse
+import json
+import sys
+
+from ocean_ai.rag_retriever import OceanRAGRetriever
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Ocean AI POC - Command Line Interface")
+    parser.add_argument("--config", "-c", default="config.yaml", help="Configuration file path")
+    parser.add_argument("--question", "-q", required=True, help="Question to ask")
+    parser.add_argument("--max-results", type=int, default=5, help="Maximum results to retrieve")
+    parser.add_argument("--similarity-threshold", type=float, default=0.4, help="Similarity threshold")
+    parser.add_argument("--doc-type", help="Filter by document type")
+    parser.add_argument("--geographic", help="Filter by geographic region")
+    parser.add_argument("--topic", help="Filter by topic label (e.g. seagrass_restoration)")
+    parser.add_argument("--output-format", choices=["text", "json"], default="text", help="Output format")
+    
+    args = parser.parse_args()
+    
+    try:
+        # Initialize retriever
+        retriever = OceanRAGRetriever(args.config)
+        
+        # Execute query
+        result = retriever.query(
+            question=args.question,
+            max_results=args.max_results,
+            similarity_threshold=args.similarity_threshold,
+            doc_type_filter=args.doc_type,
+            geographic_filter=args.geographic,
+            topic_filter=args.topic
+        )
+        
+        # Output results
+        if args.output_format == "json":
+            print(json.dumps(result, indent=2))
+        else:
+            # Text format (similar to rag_retriever.py output)
+            print(f"Question: {result['metadata']['question']}")
+            print(f"\nAnswer: {result['answer']}")
+            print(f"\nSources ({len(result['sources'])}):")
+            for i, source in enumerate(result['sources'], 1):
+                print(f"  {i}. {source['filename']} ({source['organization']}) - Similarity: {source['similarity_score']}")
+            print(f"\nResults found: {result['metadata']['results_count']}")
+    
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,88 @@ Database setup script for Ocean AI POC
 Creates the necessary tables and extensions for the RAG system.
 """
 
+from typing import List, Tuple
+
 import psycopg2
-import yaml
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
-def load_config():
-    """Load configuration from config.yaml"""
-    with open('config.yaml', 'r') as f:
-        return yaml.safe_load(f)
+from ocean_ai.config import load_config
+from ocean_ai.db import connection_kwargs, cursor, get_embedding_storage, parse_version
+
+HNSW_MIN_VERSION = (0, 5)
+HALFVEC_MIN_VERSION = (0, 7)
+
+# Enables pgvector and reports its version plus the current chunks embedding columns
+EXTENSION_AND_STORAGE_SQL = """
+    CREATE EXTENSION IF NOT EXISTS vector;
+    SELECT
+        (SELECT extversion FROM pg_extension WHERE extname = 'vector'),
+        (SELECT udt_name FROM information_schema.columns
+         WHERE table_name = 'chunks' AND column_name = 'embedding'),
+        EXISTS (SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'chunks' AND column_name = 'embedding_bin');
+"""
+
+def embedding_columns_sql(pgvector_version: tuple) -> str:
+    """Column definitions for chunk embeddings, using the most compact type pgvector supports"""
+    if pgvector_version >= HALFVEC_MIN_VERSION:
+        # Half precision halves the bytes read per similarity comparison; the sign bits
+        # feed a Hamming-distance prefilter whose candidates are re-ranked by cosine
+        return """embedding halfvec(1536),  -- OpenAI text-embedding-3-small dimension
+            embedding_bin bit(1536) GENERATED ALWAYS AS (binary_quantize(embedding)::bit(1536)) STORED,"""
+    return "embedding vector(1536),  -- OpenAI text-embedding-3-small dimension"
+
+def vector_index_statements(embedding_type: str, has_embedding_bin: bool,
+                            pgvector_version: tuple) -> List[Tuple[str, str]]:
+    """
+    Build the similarity search index DDL matching the stored embedding type
+    
+    Returns:
+        (statement, description) pairs
+    """
+    statements = []
+    
+    # HNSW (pgvector >= 0.5) needs no training and keeps its recall as the corpus grows
+    if embedding_type == 'halfvec':
+        statements.append(("""
+            CREATE INDEX IF NOT EXISTS chunks_embedding_hnsw_idx 
+            ON chunks USING hnsw (embedding halfvec_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+        """, "Vector index created (hnsw, halfvec)"))
+    elif pgvector_version >= HNSW_MIN_VERSION:
+        statements.append(("""
+            CREATE INDEX IF NOT EXISTS chunks_embedding_hnsw_idx 
+            ON chunks USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+        """, "Vector index created (hnsw)"))
+    else:
+        statements.append(("""
+            CREATE INDEX IF NOT EXISTS chunks_embedding_idx 
+            ON chunks USING ivfflat (embedding vector_cosine_ops)
+            WITH (lists = 100)
+        """, "Vector index created (ivfflat, upgrade pgvector to 0.5+ for hnsw)"))
+    
+    if embedding_type == 'halfvec' or pgvector_version >= HNSW_MIN_VERSION:
+        # An ivfflat index left over from older pgvector could still be picked by the
+        # planner (with probes = 1, i.e. poor recall), so it goes once hnsw exists
+        statements.append(("DROP INDEX IF EXISTS chunks_embedding_idx",
+                           "Superseded ivfflat vector index dropped (if present)"))
+    
+    if has_embedding_bin:
+        statements.append(("""
+            CREATE INDEX IF NOT EXISTS chunks_embedding_bin_idx 
+            ON chunks USING hnsw (embedding_bin bit_hamming_ops)
+            WITH (m = 16, ef_construction = 64)
+        """, "Binary vector index created (hnsw)"))
+    
+    return statements
+
+def create_vector_indexes(cur, pgvector_version: tuple):
+    """Create the similarity search indexes matching the stored embedding type"""
+    embedding_type, has_embedding_bin = get_embedding_storage(cur.connection)
+    for statement, description in vector_index_statements(embedding_type, has_embedding_bin, pgvector_version):
+        cur.execute(statement)
+        print(description)
 
 def create_database_and_tables():
     """Set up the database with pgvector extension and required tables"""
@@ -19,94 +93,100 @@ def create_database_and_tables():
     db_config = config['postgres']
     
     # Connect to PostgreSQL (to postgres database first)
-    conn = psycopg2.connect(
-        host=db_config['host'],
-        port=db_config['port'],
-        dbname='postgres',  # Connect to default postgres database first
-        user=db_config['user'],
-        password=db_config['password'],
-        sslmode=db_config['sslmode']
-    )
+    # This one-off connection stays outside the pool, which only serves the target database
+    conn = psycopg2.connect(**connection_kwargs(
+        db_config,
+        dbname='postgres'  # Connect to default postgres database first
+    ))
     conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-    cursor = conn.cursor()
+    cur = conn.cursor()
     
     # Create database if it doesn't exist
     try:
-        cursor.execute(f"CREATE DATABASE {db_config['dbname']}")
+        cur.execute(f"CREATE DATABASE {db_config['dbname']}")
         print(f"Database '{db_config['dbname']}' created successfully")
     except psycopg2.errors.DuplicateDatabase:
         print(f"Database '{db_config['dbname']}' already exists")
     except Exception as e:
         print(f"Database '{db_config['dbname']}' already exists or error: {e}")
     
-    cursor.close()
+    cur.close()
     conn.close()
     
-    # Connect to our target database
-    conn = psycopg2.connect(
-        host=db_config['host'],
-        port=db_config['port'],
-        dbname=db_config['dbname'],
-        user=db_config['user'],
-        password=db_config['password'],
-        sslmode=db_config['sslmode']
-    )
-    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-    cursor = conn.cursor()
-    
-    # Create pgvector extension
-    try:
-        cursor.execute("CREATE EXTENSION IF NOT EXISTS vector")
-        print("pgvector extension enabled")
-    except Exception as e:
-        print(f"Error creating pgvector extension: {e}")
-    
-    # Create documents table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS documents (
-            id SERIAL PRIMARY KEY,
-            filename VARCHAR(255) NOT NULL,
-            doc_type VARCHAR(100),
-            organization VARCHAR(255),
-            upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            file_size INTEGER,
-            metadata JSONB
-        )
-    """)
-    print("Documents table created")
+    # Work on our target database through the shared pool
+    with cursor(autocommit=True) as cur:
+        # Create pgvector extension and look at what it supports and what is already stored
+        try:
+            cur.execute(EXTENSION_AND_STORAGE_SQL)
+            print("pgvector extension enabled")
+        except Exception as e:
+            print(f"Error creating pgvector extension: {e}")
+            return
+        version, existing_embedding_type, has_embedding_bin = cur.fetchone()
+        pgvector_version = parse_version(version)
+        
+        # Indexes must match the embedding column of an existing table, not the one we would create
+        if existing_embedding_type:
+            embedding_type = existing_embedding_type
+        else:
+            embedding_type = 'halfvec' if pgvector_version >= HALFVEC_MIN_VERSION else 'vector'
+            has_embedding_bin = embedding_type == 'halfvec'
+        index_statements = vector_index_statements(embedding_type, has_embedding_bin, pgvector_version)
+        index_ddl = ";\n".join(statement for statement, _ in index_statements)
+        
+        # All remaining DDL goes out in one round trip. Under autocommit PostgreSQL runs
+        # it as a single implicit transaction, so a failure leaves nothing half-created;
+        # IF NOT EXISTS keeps reruns safe.
+        try:
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS documents (
+                    id SERIAL PRIMARY KEY,
+                    filename VARCHAR(255) NOT NULL,
+                    doc_type VARCHAR(100),
+                    organization VARCHAR(255),
+                    upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    file_size INTEGER,
+                    metadata JSONB
+                );
+            
+                CREATE TABLE IF NOT EXISTS chunks (
+                    id SERIAL PRIMARY KEY,
+                    doc_id INTEGER REFERENCES documents(id) ON DELETE CASCADE,
+                    chunk_index INTEGER NOT NULL,
+                    content TEXT NOT NULL,
+                    {embedding_columns_sql(pgvector_version)}
+                    token_count INTEGER,
+                    metadata JSONB,
+                    content_sha256 BYTEA,  -- lets ingest reuse the embedding of identical chunk text
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                ALTER TABLE chunks ADD COLUMN IF NOT EXISTS content_sha256 BYTEA;
+            
+                -- Keep content and embedding inline in the heap tuple instead of in TOAST,
+                -- so hydrating a search hit reads one page rather than chasing TOAST chunks
+                ALTER TABLE chunks SET (toast_tuple_target = 8160);
+            
+                {index_ddl};
+            
+                CREATE INDEX IF NOT EXISTS idx_documents_doc_type ON documents(doc_type);
+                CREATE INDEX IF NOT EXISTS idx_documents_organization ON documents(organization);
+                -- A document is identified by name and size; ingest relies on this for
+                -- INSERT ... ON CONFLICT DO NOTHING instead of a separate existence check
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_documents_filename_file_size
+                ON documents(filename, file_size);
+                CREATE INDEX IF NOT EXISTS idx_chunks_doc_id ON chunks(doc_id);
+                -- Not unique: the same boilerplate chunk is stored once per document containing it
+                CREATE INDEX IF NOT EXISTS idx_chunks_content_sha256 ON chunks(content_sha256);
+            """)
+        except Exception as e:
+            print(f"Error creating tables and indexes: {e}")
+            return
+        print("Documents table created")
+        print("Chunks table created")
+        for _, description in index_statements:
+            print(description)
+        print("Additional indexes created")
     
-    # Create chunks table with vector embeddings
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS chunks (
-            id SERIAL PRIMARY KEY,
-            doc_id INTEGER REFERENCES documents(id) ON DELETE CASCADE,
-            chunk_index INTEGER NOT NULL,
-            content TEXT NOT NULL,
-            embedding vector(1536),  -- OpenAI text-embedding-3-small dimension
-            token_count INTEGER,
-            metadata JSONB,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    print("Chunks table created")
-    
-    # Create index on embeddings for faster similarity search
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS chunks_embedding_idx 
-        ON chunks USING ivfflat (embedding vector_cosine_ops)
-        WITH (lists = 100)
-    """)
-    print("Vector index created")
-    
-    # Create indexes for better query performance
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_documents_doc_type ON documents(doc_type)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_documents_organization ON documents(organization)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_doc_id ON chunks(doc_id)")
-    
-    print("Additional indexes created")
-    
-    cursor.close()
-    conn.close()
     print("Database setup completed successfully!")
 
 if __name__ == "__main__":
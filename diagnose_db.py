@@ -4,14 +4,52 @@ Database Diagnostic Script
 Checks database schema and helps troubleshoot common issues.
 """
 
-import yaml
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from ocean_ai.config import load_config
+from ocean_ai.db import VECTOR_INDEX_NAMES, cursor, get_pool
 
-def load_config():
-    """Load configuration from config.yaml"""
-    with open('config.yaml', 'r') as f:
-        return yaml.safe_load(f)
+# Everything the diagnosis needs, as a single JSONB document. The document count goes
+# through query_to_xml so the statement still parses when the documents table is missing.
+DIAGNOSTIC_REPORT_SQL = """
+    WITH
+    tbls AS (
+        SELECT table_name
+        FROM information_schema.tables
+        WHERE table_schema = 'public' AND table_name IN ('documents', 'chunks')
+    ),
+    cols AS (
+        SELECT table_name, column_name, data_type, udt_name, is_nullable, ordinal_position
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name IN ('documents', 'chunks')
+    ),
+    idxs AS (
+        SELECT indexname, tablename
+        FROM pg_indexes
+        WHERE schemaname = 'public' AND tablename IN ('documents', 'chunks')
+    )
+    SELECT jsonb_build_object(
+        'pgvector_version', (SELECT extversion FROM pg_extension WHERE extname = 'vector'),
+        'tables', COALESCE((SELECT jsonb_agg(table_name) FROM tbls), '[]'::jsonb),
+        'columns', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'table_name', table_name,
+                'column_name', column_name,
+                'data_type', data_type,
+                'udt_name', udt_name,
+                'is_nullable', is_nullable
+            ) ORDER BY table_name, ordinal_position)
+            FROM cols
+        ), '[]'::jsonb),
+        'indexes', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object('indexname', indexname, 'tablename', tablename))
+            FROM idxs
+        ), '[]'::jsonb),
+        'document_count', CASE WHEN to_regclass('public.documents') IS NOT NULL THEN
+            (xpath('/row/count/text()',
+                   query_to_xml('SELECT COUNT(*) AS count FROM public.documents', false, true, ''))
+            )[1]::text::bigint
+        END
+    ) AS report;
+"""
 
 def diagnose_database():
     """Diagnose database schema and connection issues"""
@@ -26,51 +64,37 @@ def diagnose_database():
         print(f"User: {db_config['user']}")
         print()
         
-        # Test connection
+        # Test connection (creating the pool opens the first connection)
         try:
-            conn = psycopg2.connect(
-                host=db_config['host'],
-                port=db_config['port'],
-                dbname=db_config['dbname'],
-                user=db_config['user'],
-                password=db_config['password'],
-                sslmode=db_config['sslmode'],
-                cursor_factory=RealDictCursor
-            )
+            get_pool()
             print("✅ Database connection successful")
         except Exception as e:
             print(f"❌ Database connection failed: {e}")
             return
         
-        cursor = conn.cursor()
+        with cursor() as cur:
+            # Gather the whole report in one round-trip
+            cur.execute(DIAGNOSTIC_REPORT_SQL)
+            report = cur.fetchone()[0]
         
         # Check if pgvector extension exists
-        cursor.execute("SELECT * FROM pg_extension WHERE extname='vector';")
-        vector_ext = cursor.fetchall()
-        if vector_ext:
-            print("✅ pgvector extension is installed")
+        if report['pgvector_version']:
+            print(f"✅ pgvector extension is installed (version {report['pgvector_version']})")
         else:
             print("❌ pgvector extension is NOT installed")
         
+        columns_by_table = {'documents': [], 'chunks': []}
+        for col in report['columns']:
+            columns_by_table[col['table_name']].append(col)
+        
         # Check if documents table exists
-        cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' AND table_name = 'documents';
-        """)
-        documents_table = cursor.fetchall()
+        documents_table = 'documents' in report['tables']
         
         if documents_table:
             print("✅ documents table exists")
             
             # Check columns in documents table
-            cursor.execute("""
-                SELECT column_name, data_type, is_nullable
-                FROM information_schema.columns
-                WHERE table_name = 'documents' AND table_schema = 'public'
-                ORDER BY ordinal_position;
-            """)
-            columns = cursor.fetchall()
+            columns = columns_by_table['documents']
             
             print("📋 documents table columns:")
             expected_columns = ['id', 'filename', 'doc_type', 'organization', 'upload_date', 'file_size', 'metadata']
@@ -91,25 +115,38 @@ def diagnose_database():
             print("❌ documents table does NOT exist")
         
         # Check if chunks table exists
-        cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' AND table_name = 'chunks';
-        """)
-        chunks_table = cursor.fetchall()
-        
-        if chunks_table:
+        if 'chunks' in report['tables']:
             print("✅ chunks table exists")
+            
+            # Check columns in chunks table
+            chunk_columns = {col['column_name']: col['udt_name'] for col in columns_by_table['chunks']}
+            
+            expected_chunk_columns = ['id', 'doc_id', 'chunk_index', 'content', 'embedding',
+                                      'token_count', 'metadata', 'content_sha256', 'created_at']
+            # Setup only adds the binary-quantized column alongside halfvec (pgvector 0.7+)
+            if chunk_columns.get('embedding') == 'halfvec':
+                expected_chunk_columns.append('embedding_bin')
+            missing_chunk_columns = [col for col in expected_chunk_columns if col not in chunk_columns]
+            if missing_chunk_columns:
+                print(f"⚠️ chunks table missing columns: {', '.join(missing_chunk_columns)}")
+            else:
+                print("✅ All expected chunks columns present")
+            
+            embedding_type = chunk_columns.get('embedding')
+            if embedding_type == 'halfvec':
+                print("✅ Embeddings stored as halfvec")
+            elif embedding_type == 'vector':
+                print("⚠️ Embeddings stored as full-precision vector (pgvector 0.7+: run python migrate_halfvec.py)")
+            else:
+                print(f"❌ Unexpected embedding column type: {embedding_type}")
+            
+            if chunk_columns.get('embedding_bin', 'bit') != 'bit':
+                print(f"❌ Unexpected embedding_bin column type: {chunk_columns['embedding_bin']}")
         else:
             print("❌ chunks table does NOT exist")
         
         # Check indexes
-        cursor.execute("""
-            SELECT indexname, tablename 
-            FROM pg_indexes 
-            WHERE tablename IN ('documents', 'chunks') AND schemaname = 'public';
-        """)
-        indexes = cursor.fetchall()
+        indexes = report['indexes']
         
         if indexes:
             print("📋 Indexes found:")
@@ -118,17 +155,17 @@ def diagnose_database():
         else:
             print("❌ No indexes found")
         
+        vector_indexes = [idx['indexname'] for idx in indexes if idx['indexname'] in VECTOR_INDEX_NAMES]
+        if 'chunks_embedding_hnsw_idx' in vector_indexes:
+            print("✅ Vector index uses hnsw")
+        elif vector_indexes:
+            print("⚠️ Vector index uses ivfflat (upgrade pgvector to 0.5+ and rerun python database_setup.py for hnsw)")
+        else:
+            print("❌ Vector index on chunks.embedding is missing")
+        
         # Count existing documents
         if documents_table:
-            try:
-                cursor.execute("SELECT COUNT(*) as count FROM documents;")
-                doc_count = cursor.fetchone()
-                print(f"📊 Documents in database: {doc_count['count']}")
-            except Exception as e:
-                print(f"❌ Error counting documents: {e}")
-        
-        cursor.close()
-        conn.close()
+            print(f"📊 Documents in database: {report['document_count']}")
         
         print("\n🔧 Troubleshooting Steps:")
         if not documents_table:
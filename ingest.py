@@ -5,60 +5,96 @@ Processes PDFs and documents, creates embeddings, and stores in PostgreSQL with
 """
 
 import os
+import re
 import argparse
-import yaml
 import hashlib
-from typing import List, Dict, Any, Optional, Union
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
+from dataclasses import dataclass
 from pathlib import Path
 import json
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
-import PyPDF2
-from openai import OpenAI
+import numpy as np
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-import tiktoken
+from openai import RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
-class DocumentIngestor:
-    def __init__(self, config_path: str = "config.yaml"):
-        """Initialize the document ingestor with configuration"""
-        self.config = self.load_config(config_path)
-        self.openai_client = OpenAI(api_key=self.config['openai']['api_key'])
-        self.embedding_model = self.config['openai']['embedding_model']
+from ocean_ai.config import load_config
+from ocean_ai.db import copy_chunks, cursor, get_pool, register_vector_types
+from ocean_ai.openai_client import get_openai_client
+from ocean_ai.pdf import extract_pdf_text
+from ocean_ai.tokens import get_encoding
+
+# Filename keyword tables for extract_metadata_from_filename
+DOC_TYPE_PATTERNS = [
+    (re.compile(r"sustainability|esg|csr"), 'sustainability_report'),
+    (re.compile(r"annual|quarterly|financial"), 'company_report'),
+    (re.compile(r"esrs|european sustainability reporting"), 'esrs_document'),
+]
+
+GEOGRAPHIC_TERMS = {
+    'baltic': 'Baltic Sea',
+    'north sea': 'North Sea',
+    'mediterranean': 'Mediterranean Sea',
+    'atlantic': 'Atlantic Ocean',
+    'pacific': 'Pacific Ocean',
+    'arctic': 'Arctic Ocean'
+}
+
+OCEAN_TOPICS = {
+    'seagrass': 'seagrass_restoration',
+    'coral': 'coral_conservation',
+    'biodiversity': 'marine_biodiversity',
+    'carbon': 'blue_carbon',
+    'plastic': 'marine_pollution',
+    'fishing': 'sustainable_fisheries',
+    'renewable': 'offshore_renewable_energy'
+}
+
+GEOGRAPHIC_PATTERN = re.compile("|".join(map(re.escape, GEOGRAPHIC_TERMS)))
+TOPIC_PATTERN = re.compile("|".join(map(re.escape, OCEAN_TOPICS)))
+
+# Chunks per embeddings request (OpenAI accepts up to 2048 inputs)
+EMBEDDING_BATCH_SIZE = 1000
+# Embeddings requests in flight at once; well within OpenAI's per-minute request limit
+EMBEDDING_CONCURRENCY = 8
+
+@dataclass
+class PreparedDocument:
+    """A document that has been read and split, ready to be embedded and stored"""
+    filename: str
+    doc_type: str
+    organization: Optional[str]
+    file_size: int
+    metadata: Dict[str, Any]
+    chunks: List[str]
+    token_counts: List[int]
+    content_hashes: List[bytes]
+    chunk_metadata: List[Dict[str, Any]]
+
+class DocumentPreparer:
+    """
+    Reads, splits, token-counts and hashes documents
+
+    Needs neither the database nor the OpenAI API, so parallel ingest workers
+    use it on its own.
+    """
+    
+    def __init__(self):
+        """Initialize the text splitter and tokenizer"""
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
             chunk_overlap=200,
             length_function=len,
             separators=["\n\n", "\n", ". ", " ", ""]
         )
-        self.encoding = tiktoken.get_encoding("cl100k_base")
-        
-    def load_config(self, config_path: str) -> dict:
-        """Load configuration from YAML file"""
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
-    
-    def get_db_connection(self):
-        """Get PostgreSQL database connection"""
-        db_config = self.config['postgres']
-        return psycopg2.connect(
-            host=db_config['host'],
-            port=db_config['port'],
-            dbname=db_config['dbname'],
-            user=db_config['user'],
-            password=db_config['password'],
-            sslmode=db_config['sslmode'],
-            cursor_factory=RealDictCursor
-        )
+        self.encoding = get_encoding("cl100k_base")
     
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract text content from PDF file"""
-        text = ""
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+            text = extract_pdf_text(pdf_path)
         except Exception as e:
             print(f"Error extracting text from {pdf_path}: {e}")
             return ""
@@ -69,46 +105,23 @@ class DocumentIngestor:
         metadata = {}
         filename_lower = filename.lower()
         
-        # Document type detection
-        if any(term in filename_lower for term in ['sustainability', 'esg', 'csr']):
-            metadata['doc_type'] = 'sustainability_report'
-        elif any(term in filename_lower for term in ['annual', 'quarterly', 'financial']):
-            metadata['doc_type'] = 'company_report'
-        elif 'esrs' in filename_lower or 'european sustainability reporting' in filename_lower:
-            metadata['doc_type'] = 'esrs_document'
-        else:
-            metadata['doc_type'] = 'unknown'
-        
-        # Geographic focus detection
-        geographic_terms = {
-            'baltic': 'Baltic Sea',
-            'north sea': 'North Sea',
-            'mediterranean': 'Mediterranean Sea',
-            'atlantic': 'Atlantic Ocean',
-            'pacific': 'Pacific Ocean',
-            'arctic': 'Arctic Ocean'
-        }
+        # Document type detection (first matching rule wins)
+        metadata['doc_type'] = 'unknown'
+        for pattern, doc_type in DOC_TYPE_PATTERNS:
+            if pattern.search(filename_lower):
+                metadata['doc_type'] = doc_type
+                break
         
-        for term, region in geographic_terms.items():
-            if term in filename_lower:
+        # Geographic focus detection (one scan; the earliest term in the table wins)
+        geographic_matches = set(GEOGRAPHIC_PATTERN.findall(filename_lower))
+        for term, region in GEOGRAPHIC_TERMS.items():
+            if term in geographic_matches:
                 metadata['geographic_focus'] = region
                 break
         
-        # Topic detection
-        ocean_topics = {
-            'seagrass': 'seagrass_restoration',
-            'coral': 'coral_conservation',
-            'biodiversity': 'marine_biodiversity',
-            'carbon': 'blue_carbon',
-            'plastic': 'marine_pollution',
-            'fishing': 'sustainable_fisheries',
-            'renewable': 'offshore_renewable_energy'
-        }
-        
-        metadata['topics'] = []
-        for term, topic in ocean_topics.items():
-            if term in filename_lower:
-                metadata['topics'].append(topic)
+        # Topic detection (one scan; topics keep the table's order)
+        topic_matches = set(TOPIC_PATTERN.findall(filename_lower))
+        metadata['topics'] = [topic for term, topic in OCEAN_TOPICS.items() if term in topic_matches]
         
         return metadata
     
@@ -116,92 +129,28 @@ class DocumentIngestor:
         """Count tokens in text using tiktoken"""
         return len(self.encoding.encode(text))
     
-    def create_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Create embeddings for a list of texts using OpenAI"""
-        try:
-            response = self.openai_client.embeddings.create(
-                input=texts,
-                model=self.embedding_model
-            )
-            return [embedding.embedding for embedding in response.data]
-        except Exception as e:
-            print(f"Error creating embeddings: {e}")
-            return []
-    
-    def document_exists(self, filename: str, file_size: int) -> bool:
-        """Check if document already exists in database"""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "SELECT id FROM documents WHERE filename = %s AND file_size = %s",
-            (filename, file_size)
-        )
-        result = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
-        
-        return result is not None
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Count tokens of several texts using tiktoken's threaded batch encoder"""
+        return [len(tokens) for tokens in self.encoding.encode_batch(texts)]
     
-    def store_document(self, filename: str, doc_type: str, organization: Optional[str], 
-                      file_size: int, metadata: Dict[str, Any]) -> int:
-        """Store document metadata in database and return document ID"""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO documents (filename, doc_type, organization, file_size, metadata)
-            VALUES (%s, %s, %s, %s, %s)
-            RETURNING id
-        """, (filename, doc_type, organization, file_size, json.dumps(metadata)))
-        
-        result = cursor.fetchone()
-        if result is None:
-            raise RuntimeError("Failed to insert document - no ID returned")
-        # RealDictCursor returns dict-like rows, but type checker needs help
-        doc_id = int(result[0] if isinstance(result, tuple) else result['id'])
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return doc_id
-    
-    def store_chunks(self, doc_id: int, chunks: List[str], embeddings: List[List[float]], 
-                    chunk_metadata: List[Dict[str, Any]]):
-        """Store document chunks and embeddings in database"""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        for i, (chunk, embedding, metadata) in enumerate(zip(chunks, embeddings, chunk_metadata)):
-            token_count = self.count_tokens(chunk)
-            
-            cursor.execute("""
-                INSERT INTO chunks (doc_id, chunk_index, content, embedding, token_count, metadata)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (doc_id, i, chunk, embedding, token_count, json.dumps(metadata)))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-    
-    def ingest_document(self, file_path: Union[str, Path], organization: Optional[str] = None, original_filename: Optional[str] = None) -> bool:
-        """Ingest a single document"""
+    def prepare_document(self, file_path: Union[str, Path], organization: Optional[str] = None,
+                         original_filename: Optional[str] = None) -> Optional[PreparedDocument]:
+        """
+        Read and split a document, without embedding or storing it
+        
+        Returns:
+            The prepared document, or None if it could not be read
+        """
         file_path_obj = Path(file_path)
         
         if not file_path_obj.exists():
             print(f"File not found: {file_path_obj}")
-            return False
+            return None
         
         # Use original filename if provided, otherwise use the file path name
         filename = original_filename if original_filename else file_path_obj.name
         file_size = file_path_obj.stat().st_size
         
-        # Check if document already exists
-        if self.document_exists(filename, file_size):
-            print(f"Document {filename} already exists in database, skipping...")
-            return True
-        
         print(f"Ingesting document: {filename}")
         
         # Extract text based on file type
@@ -214,19 +163,16 @@ class DocumentIngestor:
                     text = f.read()
             except Exception as e:
                 print(f"Error reading file {file_path_obj}: {e}")
-                return False
+                return None
         
         if not text.strip():
             print(f"No text extracted from {filename}")
-            return False
+            return None
         
         # Extract metadata
         metadata = self.extract_metadata_from_filename(filename)
         doc_type = metadata.get('doc_type', 'unknown')
         
-        # Store document metadata
-        doc_id = self.store_document(filename, doc_type, organization, file_size, metadata)
-        
         # Split text into chunks
         chunks = self.text_splitter.split_text(text)
         print(f"Created {len(chunks)} chunks from {filename}")
@@ -239,26 +185,209 @@ class DocumentIngestor:
             chunk_meta['source_file'] = filename
             chunk_metadata.append(chunk_meta)
         
-        # Create embeddings (batch process for efficiency)
-        batch_size = 100  # OpenAI allows up to 2048 inputs per request
-        all_embeddings = []
+        return PreparedDocument(
+            filename=filename,
+            doc_type=doc_type,
+            organization=organization,
+            file_size=file_size,
+            metadata=metadata,
+            chunks=chunks,
+            # Counted once here, in the worker process, and reused when storing
+            token_counts=self.count_tokens_batch(chunks),
+            content_hashes=[hashlib.sha256(chunk.encode('utf-8')).digest() for chunk in chunks],
+            chunk_metadata=chunk_metadata
+        )
+
+class DocumentIngestor(DocumentPreparer):
+    def __init__(self, config_path: str = "config.yaml"):
+        """Initialize the document ingestor with configuration"""
+        super().__init__()
+        self.config_path = config_path
+        self.config = self.load_config(config_path)
+        self.openai_client = get_openai_client(self.config['openai']['api_key'])
+        self.embedding_model = self.config['openai']['embedding_model']
+        # Pooled connections to this config's database are reused across documents
+        self.pool = get_pool(config_path)
         
-        for i in range(0, len(chunks), batch_size):
-            batch_chunks = chunks[i:i + batch_size]
-            batch_embeddings = self.create_embeddings(batch_chunks)
-            all_embeddings.extend(batch_embeddings)
-            print(f"Created embeddings for chunks {i+1}-{min(i+batch_size, len(chunks))}")
+    def load_config(self, config_path: str) -> dict:
+        """Load configuration from YAML file"""
+        return load_config(config_path)
+    
+    def create_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Create embeddings for a list of texts using OpenAI
         
-        if len(all_embeddings) != len(chunks):
-            print(f"Error: Embedding count mismatch. Expected {len(chunks)}, got {len(all_embeddings)}")
-            return False
+        Returns:
+            A float32 array with one row per text (no rows if the request failed)
+        """
+        try:
+            return self._request_embeddings(texts)
+        except Exception as e:
+            print(f"Error creating embeddings: {e}")
+            return np.empty((0, 0), dtype=np.float32)
+    
+    @retry(retry=retry_if_exception_type(RateLimitError), wait=wait_random_exponential(min=1, max=60),
+           stop=stop_after_attempt(6), reraise=True)
+    def _request_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Send one embeddings request, backing off and retrying when rate limited"""
+        response = self.openai_client.embeddings.create(
+            input=texts,
+            model=self.embedding_model
+        )
+        return np.asarray([embedding.embedding for embedding in response.data], dtype=np.float32)
+    
+    def document_exists(self, cur, filename: str, file_size: int) -> bool:
+        """Check if document already exists in database"""
+        cur.execute(
+            "SELECT id FROM documents WHERE filename = %s AND file_size = %s",
+            (filename, file_size)
+        )
+        return cur.fetchone() is not None
+    
+    def store_document(self, cur, filename: str, doc_type: str, organization: Optional[str], 
+                      file_size: int, metadata: Dict[str, Any]) -> Optional[int]:
+        """Store document metadata in database and return document ID, or None if it already exists"""
+        cur.execute("""
+            INSERT INTO documents (filename, doc_type, organization, file_size, metadata)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (filename, file_size) DO NOTHING
+            RETURNING id
+        """, (filename, doc_type, organization, file_size, json.dumps(metadata)))
         
-        # Store chunks and embeddings
-        self.store_chunks(doc_id, chunks, all_embeddings, chunk_metadata)
+        result = cur.fetchone()
+        if result is None:
+            return None
+        # RealDictCursor returns dict-like rows, but type checker needs help
+        return int(result[0] if isinstance(result, tuple) else result['id'])
+    
+    def find_stored_documents(self, files: List[Tuple[str, int]]) -> Set[Tuple[str, int]]:
+        """
+        Return which of the given (filename, file_size) pairs are already stored
+        
+        One read-only query, so a re-run over an ingested directory skips those
+        files before extracting their text.
+        """
+        if not files:
+            return set()
+        with cursor(pool=self.pool) as cur:
+            cur.execute(
+                "SELECT filename, file_size FROM documents WHERE (filename, file_size) IN %s",
+                (tuple(files),)
+            )
+            return {(filename, file_size) for filename, file_size in cur.fetchall()}
+    
+    def find_existing_embeddings(self, cur, content_hashes: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Return the stored embeddings of chunks whose content has one of the given sha256 digests"""
+        if not content_hashes:
+            return {}
+        register_vector_types(cur.connection)
+        # Cast to vector so both vector and halfvec columns come back as float32 arrays
+        cur.execute("""
+            SELECT DISTINCT ON (content_sha256) content_sha256, embedding::vector AS embedding
+            FROM chunks
+            WHERE content_sha256 = ANY(%s)
+        """, (list(set(content_hashes)),))
+        return {
+            bytes(row['content_sha256']): np.asarray(row['embedding'], dtype=np.float32)
+            for row in cur.fetchall()
+        }
+    
+    def store_chunks(self, cur, rows: List[tuple]):
+        """
+        Store chunks and embeddings in database
+        
+        Args:
+            rows: Tuples of (doc_id, chunk_index, content, embedding, token_count, metadata,
+                content_sha256), possibly spanning several documents
+        """
+        # Binary COPY streams all rows in one round trip without server-side value parsing
+        copy_chunks(rows, cur)
+    
+    def store_prepared_documents(self, documents: List[PreparedDocument]) -> bool:
+        """Embed the chunks of several prepared documents together and store them"""
+        all_chunks = [chunk for document in documents for chunk in document.chunks]
+        all_hashes = [content_hash for document in documents for content_hash in document.content_hashes]
+        
+        try:
+            # Boilerplate (cover pages, footers, legal text) repeats across documents; reuse its embeddings
+            with cursor(dict_cursor=True, pool=self.pool) as cur:
+                embeddings_by_hash = self.find_existing_embeddings(cur, all_hashes)
+            
+            # Embed every unseen chunk text once, even if it repeats within this batch
+            unseen = {}
+            for chunk, content_hash in zip(all_chunks, all_hashes):
+                if content_hash not in embeddings_by_hash:
+                    unseen.setdefault(content_hash, chunk)
+            unseen_hashes = list(unseen)
+            unseen_chunks = list(unseen.values())
+            if len(unseen_chunks) < len(all_chunks):
+                print(f"Reusing embeddings for {len(all_chunks) - len(unseen_chunks)} of {len(all_chunks)} chunks")
+            
+            # Create embeddings (batch process for efficiency, across document boundaries),
+            # with several requests in flight; results come back in batch order.
+            # No connection or transaction is held while they (and their retries) run.
+            starts = range(0, len(unseen_chunks), EMBEDDING_BATCH_SIZE)
+            batches = [unseen_chunks[i:i + EMBEDDING_BATCH_SIZE] for i in starts]
+            executor = ThreadPoolExecutor(max_workers=min(EMBEDDING_CONCURRENCY, len(batches)) or 1)
+            try:
+                for i, batch_chunks, batch_embeddings in zip(starts, batches,
+                                                             executor.map(self.create_embeddings, batches)):
+                    if len(batch_embeddings) != len(batch_chunks):
+                        print(f"Error: Embedding count mismatch. Expected {len(batch_chunks)}, got {len(batch_embeddings)}")
+                        return False
+                    embeddings_by_hash.update(zip(unseen_hashes[i:i + EMBEDDING_BATCH_SIZE], batch_embeddings))
+                    print(f"Created embeddings for chunks {i+1}-{min(i+EMBEDDING_BATCH_SIZE, len(unseen_chunks))}")
+            finally:
+                # Don't send the remaining requests once one batch has failed
+                executor.shutdown(cancel_futures=True)
+            
+            # Documents and their chunks are written together in one short transaction,
+            # so a failed or interrupted ingestion never leaves a document without chunks
+            stored = []
+            with cursor(dict_cursor=True, pool=self.pool) as cur:
+                rows = []
+                for document in documents:
+                    doc_id = self.store_document(cur, document.filename, document.doc_type,
+                                                 document.organization, document.file_size, document.metadata)
+                    if doc_id is None:
+                        # Stored by a concurrent ingestion since the existence check
+                        print(f"Document {document.filename} already exists in database, skipping...")
+                        continue
+                    stored.append(document)
+                    for i, (chunk, token_count, content_hash, metadata) in enumerate(zip(
+                            document.chunks, document.token_counts, document.content_hashes,
+                            document.chunk_metadata)):
+                        rows.append((doc_id, i, chunk, embeddings_by_hash[content_hash], token_count, metadata,
+                                     content_hash))
+                self.store_chunks(cur, rows)
+        except Exception as e:
+            print(f"Error storing documents: {e}")
+            return False
         
-        print(f"Successfully ingested {filename} with {len(chunks)} chunks")
+        for document in stored:
+            print(f"Successfully ingested {document.filename} with {len(document.chunks)} chunks")
         return True
     
+    def ingest_document(self, file_path: Union[str, Path], organization: Optional[str] = None, original_filename: Optional[str] = None) -> bool:
+        """Ingest a single document"""
+        file_path_obj = Path(file_path)
+        if not file_path_obj.exists():
+            print(f"File not found: {file_path_obj}")
+            return False
+        
+        # Check if document already exists (before reading it)
+        filename = original_filename if original_filename else file_path_obj.name
+        with cursor(dict_cursor=True, pool=self.pool) as cur:
+            exists = self.document_exists(cur, filename, file_path_obj.stat().st_size)
+        if exists:
+            print(f"Document {filename} already exists in database, skipping...")
+            return True
+        
+        document = self.prepare_document(file_path_obj, organization, original_filename)
+        if document is None:
+            return False
+        return self.store_prepared_documents([document])
+    
     def ingest_directory(self, directory_path: Union[str, Path], organization: Optional[str] = None) -> int:
         """Ingest all supported documents in a directory"""
         directory_path_obj = Path(directory_path)
@@ -272,14 +401,65 @@ class DocumentIngestor:
                 if f.is_file() and f.suffix.lower() in supported_extensions]
         
         successful_ingestions = 0
+        pending: List[PreparedDocument] = []
+        pending_chunks = 0
         
+        # Already stored files are skipped before any extraction
+        file_sizes = {file_path: file_path.stat().st_size for file_path in files}
+        stored = self.find_stored_documents([(f.name, size) for f, size in file_sizes.items()])
+        to_prepare = []
         for file_path in files:
-            if self.ingest_document(file_path, organization):
+            if (file_path.name, file_sizes[file_path]) in stored:
+                print(f"Document {file_path.name} already exists in database, skipping...")
                 successful_ingestions += 1
+            else:
+                to_prepare.append(file_path)
+        
+        # Phase 1: extraction and splitting are CPU-bound, so files are spread over processes.
+        # Workers are spawned rather than forked so they don't inherit this process's
+        # pooled database connections, and only get a DocumentPreparer (no pool, no API client).
+        with ProcessPoolExecutor(
+            max_workers=min(len(to_prepare), os.cpu_count() or 1) or 1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        ) as executor:
+            futures = {executor.submit(_prepare_one, str(file_path), organization): file_path
+                       for file_path in to_prepare}
+            for future in as_completed(futures):
+                try:
+                    document = future.result()
+                except Exception as e:
+                    print(f"Error ingesting {futures[future]}: {e}")
+                    continue
+                if document is None:
+                    continue
+                
+                # Phase 2: embed and store chunks of several documents per batch, flushing
+                # whenever there are enough chunks pending to fill every concurrent request
+                pending.append(document)
+                pending_chunks += len(document.chunks)
+                if pending_chunks >= EMBEDDING_BATCH_SIZE * EMBEDDING_CONCURRENCY:
+                    if self.store_prepared_documents(pending):
+                        successful_ingestions += len(pending)
+                    pending, pending_chunks = [], 0
+        
+        if pending and self.store_prepared_documents(pending):
+            successful_ingestions += len(pending)
         
         print(f"\nIngestion complete: {successful_ingestions}/{len(files)} files processed successfully")
         return successful_ingestions
 
+_worker_preparer: Optional[DocumentPreparer] = None
+
+def _init_worker():
+    """Create the preparer (splitter and tokenizer) once per worker process"""
+    global _worker_preparer
+    _worker_preparer = DocumentPreparer()
+
+def _prepare_one(file_path: str, organization: Optional[str]) -> Optional[PreparedDocument]:
+    """Read and split one file in a worker process"""
+    return _worker_preparer.prepare_document(file_path, organization)
+
 def main():
     parser = argparse.ArgumentParser(description="Ingest documents into Ocean AI knowledge base")
     parser.add_argument("--file", "-f", help="Path to a single file to ingest")
@@ -50,16 +50,18 @@ class DocumentIngestorTest:
     
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract text content from PDF file"""
-        text = ""
+        # Collect pages and join once; += would copy the accumulated text on every page
+        parts = []
         try:
             with open(pdf_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+                    parts.append(page.extract_text())
+                    parts.append("\n")
         except Exception as e:
             print(f"Error extracting text from {pdf_path}: {e}")
             return ""
-        return text.strip()
+        return "".join(parts).strip()
     
     def extract_metadata_from_filename(self, filename: str) -> Dict[str, Any]:
         """Extract metadata from filename patterns"""
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Migrate Chunk Embeddings to halfvec
+One-time migration of an existing vector(1536) chunks table to halfvec(1536) plus binary-quantized embeddings.
+"""
+
+from database_setup import HALFVEC_MIN_VERSION, create_vector_indexes
+from ocean_ai.db import VECTOR_INDEX_NAMES, cursor, get_embedding_storage, get_pgvector_version
+
+def migrate_embeddings():
+    """Downcast chunks.embedding to halfvec and add the binary embedding column"""
+    try:
+        with cursor() as cur:
+            pgvector_version = get_pgvector_version(cur)
+            if pgvector_version < HALFVEC_MIN_VERSION:
+                print(f"❌ pgvector {'.'.join(map(str, pgvector_version)) or 'not installed'} does not support halfvec")
+                print("   Solution: Upgrade pgvector to 0.7 or later, then run 'ALTER EXTENSION vector UPDATE;'")
+                return False
+
+            embedding_type, has_embedding_bin = get_embedding_storage(cur.connection)
+            if embedding_type == 'halfvec' and has_embedding_bin:
+                print("✅ Embeddings are already stored as halfvec")
+                return True
+
+            print("🔄 Migrating chunk embeddings to halfvec...")
+
+            # The old indexes are bound to the vector type, so they are rebuilt afterwards
+            for index_name in VECTOR_INDEX_NAMES:
+                cur.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+            if embedding_type != 'halfvec':
+                cur.execute("""
+                    ALTER TABLE chunks
+                    ALTER COLUMN embedding TYPE halfvec(1536) USING embedding::halfvec(1536)
+                """)
+                print("   ✅ Converted embedding column to halfvec(1536)")
+
+            cur.execute("""
+                ALTER TABLE chunks
+                ADD COLUMN IF NOT EXISTS embedding_bin bit(1536)
+                GENERATED ALWAYS AS (binary_quantize(embedding)::bit(1536)) STORED
+            """)
+            print("   ✅ Added embedding_bin column")
+
+        # Index builds run after the migration transaction has committed
+        with cursor(autocommit=True) as cur:
+            create_vector_indexes(cur, pgvector_version)
+
+        print("🎉 Migration complete!")
+        print("💡 A running Streamlit app fails its next search and then switches to halfvec; restart it to avoid that")
+        return True
+
+    except FileNotFoundError:
+        print("❌ config.yaml not found. Copy config.example.yaml to config.yaml first.")
+        return False
+    except Exception as e:
+        print(f"❌ Error migrating embeddings: {e}")
+        return False
+
+if __name__ == "__main__":
+    migrate_embeddings()
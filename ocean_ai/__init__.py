@@ -0,0 +1,4 @@
+"""
+Ocean AI POC library
+Retrieval, caching, configuration and database access shared by the app and the scripts.
+"""
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Configuration Loading for Ocean AI POC
+Parses config.yaml once per process and re-reads it only when the file changes.
+"""
+
+import os
+from functools import lru_cache
+
+import yaml
+
+@lru_cache(maxsize=1)
+def _load_config(config_path: str, mtime: float) -> dict:
+    with open(config_path, 'r') as f:
+        return yaml.safe_load(f)
+
+def load_config(config_path: str = 'config.yaml') -> dict:
+    """
+    Load configuration from a YAML file
+
+    The parsed result is cached; the file's modification time is part of the
+    cache key, so edits are picked up on the next call. Callers share the
+    returned dict and must not modify it.
+    """
+    return _load_config(config_path, os.path.getmtime(config_path))
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Database Connection Pool for Ocean AI POC
+Shares pooled PostgreSQL connections and the chunk bulk loader between ingestion and the database scripts.
+"""
+
+import io
+import json
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import psycopg2
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+from pgvector.psycopg2 import register_vector
+
+from ocean_ai.config import load_config
+
+# One pool per config file, so a second config (e.g. loaded in the Streamlit app) gets its own database
+_pools: Dict[str, ThreadedConnectionPool] = {}
+_pool_lock = threading.Lock()
+# Type OIDs differ between databases, so the adapters are registered once per (host, port, dbname)
+_vector_registered: Set[Tuple[str, int, str]] = set()
+
+# Either of these indexes serves similarity search on chunks.embedding
+VECTOR_INDEX_NAMES = ('chunks_embedding_hnsw_idx', 'chunks_embedding_idx')
+
+# Column order of the binary COPY stream written by copy_chunks; embedding_bin is generated
+COPY_CHUNK_COLUMNS = ('doc_id', 'chunk_index', 'content', 'embedding', 'token_count', 'metadata',
+                      'content_sha256')
+ChunkRow = Tuple[int, int, str, Sequence[float], Optional[int], Optional[Dict[str, Any]], Optional[bytes]]
+
+PGCOPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+PGCOPY_TRAILER = struct.pack('>h', -1)
+
+def connection_kwargs(db_config: dict, **overrides) -> dict:
+    """Build psycopg2.connect() arguments from the postgres section of the config"""
+    kwargs = dict(
+        host=db_config['host'],
+        port=db_config['port'],
+        dbname=db_config['dbname'],
+        user=db_config['user'],
+        password=db_config.get('password'),
+        sslmode=db_config.get('sslmode', 'require'),
+        # Keep idle pooled sockets alive through NATs and load balancers
+        keepalives=1,
+        keepalives_idle=30,
+        keepalives_interval=10,
+        keepalives_count=5
+    )
+    kwargs.update(overrides)
+    return kwargs
+
+def get_pool(config_path: str = 'config.yaml') -> ThreadedConnectionPool:
+    """Return the process-wide connection pool for a config file, creating it on first use"""
+    key = os.path.abspath(config_path)
+    with _pool_lock:
+        if key not in _pools:
+            db_config = load_config(config_path)['postgres']
+            _pools[key] = ThreadedConnectionPool(1, 8, **connection_kwargs(db_config))
+        return _pools[key]
+
+@contextmanager
+def cursor(dict_cursor: bool = False, autocommit: bool = False,
+           pool: Optional[ThreadedConnectionPool] = None) -> Iterator:
+    """
+    Borrow a pooled connection and yield a cursor on it
+
+    The transaction is committed when the block exits normally and rolled back
+    on error; the connection then goes back to the pool.
+
+    Args:
+        dict_cursor: Return rows as dicts (RealDictCursor) instead of tuples
+        autocommit: Run every statement in its own transaction (needed for some DDL)
+        pool: Pool to borrow from; defaults to the pool of config.yaml
+    """
+    if pool is None:
+        pool = get_pool()
+    conn = pool.getconn()
+    try:
+        conn.autocommit = autocommit
+        with conn.cursor(cursor_factory=RealDictCursor if dict_cursor else None) as cur:
+            yield cur
+        if not autocommit:
+            conn.commit()
+    except BaseException:
+        # Also on KeyboardInterrupt, so an interrupted transaction never returns to the pool open
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn, close=bool(conn.closed))
+
+def register_vector_types(conn):
+    """
+    Register the pgvector adapters so numpy arrays can be passed as vector/halfvec parameters
+
+    The registration is global, so only the first call per process and database
+    queries the type OIDs. Requires the vector extension to be installed.
+    """
+    database = (conn.info.host, conn.info.port, conn.info.dbname)
+    with _pool_lock:
+        if database not in _vector_registered:
+            register_vector(conn, globally=True)
+            _vector_registered.add(database)
+
+def parse_version(version: str) -> tuple:
+    """Turn an extension version string such as '0.7.4' into (0, 7, 4)"""
+    return tuple(int(part) for part in version.split('.') if part.isdigit())
+
+def get_pgvector_version(cur) -> tuple:
+    """Return the installed pgvector version as a tuple of ints, e.g. (0, 7, 4)"""
+    cur.execute("SELECT extversion FROM pg_extension WHERE extname='vector'")
+    row = cur.fetchone()
+    if row is None:
+        return ()
+    return parse_version(row[0])
+
+def get_embedding_storage(conn) -> Tuple[str, bool]:
+    """
+    Inspect how chunk embeddings are stored
+    
+    Returns:
+        The type of chunks.embedding ('halfvec', 'vector', or '' if missing) and
+        whether the binary-quantized chunks.embedding_bin column exists
+    """
+    with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+        cur.execute("""
+            SELECT
+                (SELECT udt_name FROM information_schema.columns
+                 WHERE table_name = 'chunks' AND column_name = 'embedding'),
+                EXISTS (SELECT 1 FROM information_schema.columns
+                        WHERE table_name = 'chunks' AND column_name = 'embedding_bin')
+        """)
+        embedding_type, has_embedding_bin = cur.fetchone()
+    return embedding_type or '', has_embedding_bin
+
+def _copy_field(data: bytes) -> bytes:
+    return struct.pack('>i', len(data)) + data
+
+def _copy_int(value: Optional[int]) -> bytes:
+    if value is None:
+        return struct.pack('>i', -1)
+    return _copy_field(struct.pack('>i', value))
+
+def _copy_vector(embedding: Sequence[float], embedding_type: str) -> bytes:
+    # pgvector's binary format: int16 dimensions, int16 unused, then big-endian
+    # float32 values (vector) or float16 values (halfvec)
+    values = np.asarray(embedding, dtype='>f2' if embedding_type == 'halfvec' else '>f4')
+    return _copy_field(struct.pack('>hh', len(values), 0) + values.tobytes())
+
+def _copy_jsonb(value: Optional[Dict[str, Any]]) -> bytes:
+    if value is None:
+        return struct.pack('>i', -1)
+    # jsonb's binary format is a version byte followed by the JSON text
+    return _copy_field(b'\x01' + json.dumps(value).encode('utf-8'))
+
+def encode_chunk_rows(rows: Iterable[ChunkRow], embedding_type: str) -> bytes:
+    """
+    Encode chunk rows as a PostgreSQL binary COPY stream
+
+    Args:
+        rows: Tuples in COPY_CHUNK_COLUMNS order
+        embedding_type: Type of chunks.embedding ('halfvec' or 'vector')
+    """
+    buffer = io.BytesIO()
+    buffer.write(PGCOPY_HEADER)
+    field_count = struct.pack('>h', len(COPY_CHUNK_COLUMNS))
+    for doc_id, chunk_index, content, embedding, token_count, metadata, content_sha256 in rows:
+        buffer.write(field_count)
+        buffer.write(_copy_int(doc_id))
+        buffer.write(_copy_int(chunk_index))
+        buffer.write(_copy_field(content.encode('utf-8')))
+        buffer.write(_copy_vector(embedding, embedding_type))
+        buffer.write(_copy_int(token_count))
+        buffer.write(_copy_jsonb(metadata))
+        buffer.write(struct.pack('>i', -1) if content_sha256 is None else _copy_field(content_sha256))
+    buffer.write(PGCOPY_TRAILER)
+    return buffer.getvalue()
+
+def copy_chunks(rows: Iterable[ChunkRow], cur=None) -> int:
+    """
+    Bulk-load chunks with COPY ... FROM STDIN (FORMAT BINARY)
+
+    One round trip replaces an INSERT per chunk. Binary COPY relies on the
+    schema's fixed column types, so rows must follow COPY_CHUNK_COLUMNS and
+    embeddings are encoded for the stored type (float16 for halfvec).
+
+    Args:
+        rows: Tuples of (doc_id, chunk_index, content, embedding, token_count, metadata, content_sha256)
+        cur: Cursor to load through (its transaction is left to the caller);
+            a pooled connection is used and committed if omitted
+
+    Returns:
+        Number of rows copied
+    """
+    if cur is None:
+        with cursor() as pooled_cur:
+            return copy_chunks(rows, pooled_cur)
+
+    embedding_type, _ = get_embedding_storage(cur.connection)
+    stream = io.BytesIO(encode_chunk_rows(rows, embedding_type))
+    cur.copy_expert(
+        f"COPY chunks({', '.join(COPY_CHUNK_COLUMNS)}) FROM STDIN WITH (FORMAT BINARY)",
+        stream
+    )
+    return cur.rowcount
@@ -0,0 +1,21 @@
+"""
+OpenAI Client Access for Ocean AI POC
+Process-wide OpenAI client whose HTTP/2 connection pool is shared by ingestion and retrieval.
+"""
+
+from functools import lru_cache
+
+import httpx
+from openai import OpenAI
+
+@lru_cache(maxsize=4)
+def get_openai_client(api_key: str) -> OpenAI:
+    """Return the OpenAI client for an API key, creating it (and its connection pool) once per process"""
+    # Keep-alive plus HTTP/2 multiplexing lets consecutive and concurrent requests
+    # skip the TCP and TLS handshakes that dominate small embedding batches
+    http_client = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        timeout=60
+    )
+    return OpenAI(api_key=api_key, http_client=http_client)
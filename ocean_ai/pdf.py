@@ -0,0 +1,40 @@
+"""
+PDF Text Extraction for Ocean AI POC
+Extracts PDF text with PyMuPDF, spreading the pages of very large documents over worker processes.
+"""
+
+import multiprocessing
+import os
+
+import pymupdf
+
+# Spawning a worker and importing PyMuPDF takes ~0.6 s, while a text-heavy page takes
+# ~1.3 ms, so a worker only breaks even at ~450 pages. Giving each at least 1000 pages keeps
+# the parallel path to documents where it clearly wins; everything smaller is read sequentially.
+PAGES_PER_WORKER = 1000
+
+def _extract_range(pdf_path: str, start: int, end: int) -> str:
+    """Extract the text of pages [start, end); every worker opens its own document"""
+    with pymupdf.open(pdf_path) as doc:
+        return "".join(doc.load_page(i).get_text() + "\n" for i in range(start, end))
+
+def extract_pdf_text(pdf_path: str) -> str:
+    """
+    Extract the text of all pages of a PDF, in page order
+
+    PyMuPDF documents cannot be shared between threads, so very large PDFs (at
+    least two workers' worth of pages) are split into page ranges that are
+    extracted in separate processes. Inside a worker
+    process (e.g. during parallel directory ingest) pages are read sequentially
+    to avoid oversubscribing the cores.
+    """
+    with pymupdf.open(pdf_path) as doc:
+        page_count = doc.page_count
+        workers = min(os.cpu_count() or 1, page_count // PAGES_PER_WORKER)
+        if workers < 2 or multiprocessing.parent_process() is not None:
+            return "".join(page.get_text() + "\n" for page in doc)
+
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    ranges = [(pdf_path, start, end) for start, end in zip(bounds, bounds[1:])]
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        return "".join(pool.starmap(_extract_range, ranges))
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Query Result Cache for Ocean AI POC
+Two-tier cache for RAG query results: exact-match LRU plus semantic lookup on query embeddings.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import RLock
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+@dataclass
+class CacheEntry:
+    """A cached query result and the bookkeeping needed to expire it"""
+    result: Dict[str, Any]
+    scope: str
+    created_at: float
+    slot: Optional[int] = None
+
+class QueryCache:
+    def __init__(self,
+                 max_size: int = 128,
+                 ttl_seconds: float = 3600,
+                 similarity_threshold: float = 0.95,
+                 dimensions: int = 1536):
+        """
+        Initialize an empty cache
+
+        Args:
+            max_size: Maximum number of cached results (least recently used are evicted)
+            ttl_seconds: Time after which a cached result is considered stale
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            dimensions: Dimension of the query embeddings
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._lock = RLock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # One row per slot; rows are unit-normalized so a dot product is the cosine similarity
+        self._embeddings = np.zeros((max_size, dimensions), dtype=np.float32)
+        self._slot_keys: List[Optional[str]] = [None] * max_size
+        self._slot_scopes = np.full(max_size, None, dtype=object)
+        self._free_slots = list(range(max_size - 1, -1, -1))
+        # Embeddings of known questions (e.g. the UI's examples); never evicted or expired
+        self._pinned_embeddings: Dict[str, np.ndarray] = {}
+        self._stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "evictions": 0,
+                       "embedding_hits": 0}
+
+    @staticmethod
+    def make_scope(**params) -> str:
+        """Hash the query parameters (k, threshold, filters) that a cached result depends on"""
+        payload = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def make_key(question: str, scope: str) -> str:
+        """Hash a question together with its parameter scope"""
+        return hashlib.sha256(f"{scope}\n{question.strip()}".encode('utf-8')).hexdigest()
+
+    def _is_expired(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.created_at > self.ttl_seconds
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        if entry.slot is not None:
+            self._slot_keys[entry.slot] = None
+            self._slot_scopes[entry.slot] = None
+            self._free_slots.append(entry.slot)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the result cached under an exact key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._is_expired(entry):
+                if entry is not None:
+                    self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            self._stats["exact_hits"] += 1
+            return entry.result
+
+    def get_similar(self, embedding: List[float], scope: str) -> Optional[Dict[str, Any]]:
+        """Return the result of the most similar cached query with the same scope, or None"""
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+        query = query / norm
+
+        with self._lock:
+            scores = self._embeddings @ query
+            scores[self._slot_scopes != scope] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] >= self.similarity_threshold:
+                key = self._slot_keys[best]
+                if key is not None and not self._is_expired(self._entries[key]):
+                    self._entries.move_to_end(key)
+                    self._stats["semantic_hits"] += 1
+                    return self._entries[key].result
+                if key is not None:
+                    self._remove(key)
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, result: Dict[str, Any], scope: str,
+            embedding: Optional[List[float]] = None):
+        """Cache a result under its exact key and, if given, its query embedding"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while len(self._entries) >= self.max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._stats["evictions"] += 1
+
+            entry = CacheEntry(result=result, scope=scope, created_at=time.time())
+            if embedding is not None:
+                vector = np.asarray(embedding, dtype=np.float32)
+                norm = np.linalg.norm(vector)
+                if norm > 0:
+                    entry.slot = self._free_slots.pop()
+                    self._embeddings[entry.slot] = vector / norm
+                    self._slot_keys[entry.slot] = key
+                    self._slot_scopes[entry.slot] = scope
+            self._entries[key] = entry
+
+    def pin_embedding(self, question: str, embedding: List[float]):
+        """Keep a question's embedding so asking it later skips the embedding API call"""
+        with self._lock:
+            pinned = np.array(embedding, dtype=np.float32)
+            pinned.setflags(write=False)
+            self._pinned_embeddings[question.strip()] = pinned
+
+    def get_embedding(self, question: str) -> Optional[np.ndarray]:
+        """Return the pinned embedding of a question (read-only), or None"""
+        with self._lock:
+            embedding = self._pinned_embeddings.get(question.strip())
+            if embedding is None:
+                return None
+            self._stats["embedding_hits"] += 1
+            return embedding
+
+    def clear(self):
+        """Drop all cached results (pinned embeddings are kept)"""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "max_size": self.max_size,
+                    "pinned_embeddings": len(self._pinned_embeddings)}
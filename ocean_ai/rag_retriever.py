@@ -0,0 +1,780 @@
+#!/usr/bin/env python3
+"""
+RAG Retrieval System for Ocean AI POC
+Handles vector similarity search and context preparation for LLM responses.
+"""
+
+import json
+import asyncio
+import hashlib
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Generator
+from dataclasses import dataclass
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+import numpy as np
+from cachetools import LRUCache
+
+from ocean_ai.config import load_config
+from ocean_ai.db import get_embedding_storage, get_pgvector_version, register_vector_types
+from ocean_ai.openai_client import get_openai_client
+from ocean_ai.tokens import get_encoding
+
+# hnsw.iterative_scan (pgvector 0.8+) lets a filtered index scan continue past ef_search rows
+ITERATIVE_SCAN_MIN_VERSION = (0, 8)
+
+@dataclass
+class SearchResult:
+    """Represents a search result from the vector database"""
+    content: str
+    doc_id: int
+    chunk_id: int
+    filename: str
+    organization: str
+    doc_type: str
+    similarity_score: float
+    metadata: Dict[str, Any]
+    token_count: Optional[int] = None
+
+def embedding_error_result() -> Dict[str, Any]:
+    """Query result returned when the question could not be embedded"""
+    return {
+        "answer": "Error creating query embedding",
+        "sources": [],
+        "context": "",
+        "metadata": {}
+    }
+
+class FailedSearch(list):
+    """Empty result list standing in for a search that raised, so callers can tell it from no matches"""
+    
+    def __init__(self, error: str):
+        super().__init__()
+        self.error = error
+
+class OceanRAGRetriever:
+    def __init__(self, config_path: str = "config.yaml"):
+        """Initialize the RAG retriever with configuration"""
+        self.config = self.load_config(config_path)
+        self.openai_client = get_openai_client(self.config['openai']['api_key'])
+        self.embedding_model = self.config['openai']['embedding_model']
+        self.chat_model = self.config['openai']['chat_model']
+        self.encoding = get_encoding("cl100k_base")
+        # Minimum candidate list size for HNSW index scans; higher means better recall but slower queries
+        self.hnsw_ef_search = int(self.config.get('retrieval', {}).get('hnsw_ef_search', 40))
+        # With binary-quantized embeddings, fetch this many Hamming candidates per result to re-rank
+        self.rerank_factor = int(self.config.get('retrieval', {}).get('rerank_factor', 4))
+        self._embedding_storage: Optional[Tuple[str, bool]] = None
+        self._pgvector_version: tuple = ()
+        # Query embeddings keyed on the sha256 of the query text, so repeated questions skip the API
+        self._embedding_cache: LRUCache = LRUCache(maxsize=1024)
+        self._embedding_cache_lock = threading.Lock()
+        
+    def load_config(self, config_path: str) -> dict:
+        """Load configuration from YAML file"""
+        return load_config(config_path)
+    
+    def get_db_connection(self):
+        """Get PostgreSQL database connection"""
+        db_config = self.config['postgres']
+        conn = psycopg2.connect(
+            host=db_config['host'],
+            port=db_config['port'],
+            dbname=db_config['dbname'],
+            user=db_config['user'],
+            password=db_config['password'],
+            sslmode=db_config['sslmode'],
+            cursor_factory=RealDictCursor
+        )
+        register_vector_types(conn)
+        return conn
+    
+    def create_query_embedding(self, query: str) -> Optional[np.ndarray]:
+        """Create embedding for a query string, or return None if that fails"""
+        embeddings = self.create_query_embeddings([query])
+        return embeddings[0] if embeddings else None
+    
+    def create_query_embeddings(self, queries: List[str]) -> List[np.ndarray]:
+        """
+        Create embeddings for several query strings
+        
+        Cached embeddings are reused; the rest are created with one API call.
+        The returned float32 arrays are shared with the cache and read-only.
+        
+        Returns:
+            One embedding per query, or an empty list if the API call fails
+        """
+        keys = [hashlib.sha256(query.encode('utf-8')).hexdigest() for query in queries]
+        with self._embedding_cache_lock:
+            embeddings = [self._embedding_cache.get(key) for key in keys]
+        
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            try:
+                response = self.openai_client.embeddings.create(
+                    input=[queries[i] for i in missing],
+                    model=self.embedding_model
+                )
+            except Exception as e:
+                print(f"Error creating query embedding: {e}")
+                return []
+            
+            with self._embedding_cache_lock:
+                for i, data in zip(missing, response.data):
+                    embedding = np.asarray(data.embedding, dtype=np.float32)
+                    embedding.setflags(write=False)
+                    self._embedding_cache[keys[i]] = embeddings[i] = embedding
+        
+        return embeddings
+    
+    def search_similar_chunks(self, 
+                             query_embedding: List[float], 
+                             limit: int = 5,
+                             similarity_threshold: float = 0.0,
+                             doc_type_filter: Optional[str] = None,
+                             geographic_filter: Optional[str] = None,
+                             topic_filter: Optional[str] = None) -> List[SearchResult]:
+        """
+        Search for similar chunks using vector similarity
+        
+        Args:
+            query_embedding: The query vector
+            limit: Maximum number of results to return
+            similarity_threshold: Minimum similarity score (0-1)
+            doc_type_filter: Filter by document type
+            geographic_filter: Filter by geographic region
+            topic_filter: Filter by topic
+        """
+        return self.search_similar_chunks_batch([{
+            "query_embedding": query_embedding,
+            "limit": limit,
+            "similarity_threshold": similarity_threshold,
+            "doc_type_filter": doc_type_filter,
+            "geographic_filter": geographic_filter,
+            "topic_filter": topic_filter
+        }])[0]
+    
+    def search_similar_chunks_batch(self, searches: List[Dict[str, Any]]) -> List[List[SearchResult]]:
+        """
+        Run several similarity searches in a single SQL round-trip
+        
+        Args:
+            searches: One dict per search, holding the keyword arguments of search_similar_chunks
+        
+        Returns:
+            One list of results per search, in the same order (FailedSearch if the query failed)
+        """
+        if not searches:
+            return []
+        
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        
+        # The schema only changes through database_setup.py/migrate_halfvec.py, so inspect it once;
+        # after a migration the stale cast makes the next search fail, which clears this again
+        if self._embedding_storage is None:
+            self._embedding_storage = get_embedding_storage(conn)
+            with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as version_cursor:
+                self._pgvector_version = get_pgvector_version(version_cursor)
+        embedding_type, has_embedding_bin = self._embedding_storage
+        embedding_type = embedding_type or 'vector'
+        
+        # Each search is its own ORDER BY/LIMIT block so every one can use the vector index;
+        # query_index tells the rows of the UNION ALL apart again
+        blocks = []
+        params = []
+        scan_limits = []
+        filtered = False
+        for query_index, search in enumerate(searches):
+            # Adapted by pgvector; the casts below pick vector or halfvec for the operators
+            query_vector = np.asarray(search["query_embedding"], dtype=np.float32)
+            limit = search.get("limit", 5)
+            
+            # Filters apply to the rows the vector index scan produces, not inside the scan;
+            # see the scan settings below for how filtered searches still fill their LIMIT
+            conditions = []
+            filter_params = []
+            if search.get("doc_type_filter"):
+                conditions.append("d.doc_type = %s")
+                filter_params.append(search["doc_type_filter"])
+            if search.get("geographic_filter"):
+                conditions.append("d.metadata->>'geographic_focus' = %s")
+                filter_params.append(search["geographic_filter"])
+            if search.get("topic_filter"):
+                conditions.append("d.metadata @> %s::jsonb")
+                filter_params.append(json.dumps({"topics": [search["topic_filter"]]}))
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            filtered = filtered or bool(conditions)
+            
+            if has_embedding_bin:
+                # Two-stage: Hamming distance on sign bits picks candidates, cosine on halfvec ranks them
+                source = f"""(
+                    SELECT c.id FROM chunks c
+                    JOIN documents d ON c.doc_id = d.id
+                    {where}
+                    ORDER BY c.embedding_bin <~> binary_quantize(%s::{embedding_type})::bit(1536)
+                    LIMIT %s
+                ) candidates
+                JOIN chunks c ON c.id = candidates.id
+                JOIN documents d ON c.doc_id = d.id"""
+                source_params = [*filter_params, query_vector, limit * self.rerank_factor]
+                scan_limits.append(limit * self.rerank_factor)
+            else:
+                source = f"""chunks c
+                JOIN documents d ON c.doc_id = d.id
+                {where}"""
+                source_params = filter_params
+                scan_limits.append(limit)
+            
+            # ORDER BY uses the bare distance operator, which is what the vector index can serve
+            blocks.append(f"""(
+                SELECT 
+                    %s as query_index,
+                    c.content,
+                    c.id as chunk_id,
+                    c.doc_id,
+                    c.metadata as chunk_metadata,
+                    c.token_count,
+                    d.filename,
+                    d.organization,
+                    d.doc_type,
+                    d.metadata as doc_metadata,
+                    1 - (c.embedding <=> %s::{embedding_type}) as similarity_score
+                FROM {source}
+                ORDER BY c.embedding <=> %s::{embedding_type}
+                LIMIT %s
+            )""")
+            params.extend([query_index, query_vector, *source_params, query_vector, limit])
+        
+        full_query = "\nUNION ALL\n".join(blocks)
+        
+        # An HNSW scan returns at most ef_search rows, so size it to the largest LIMIT the
+        # index has to serve (pgvector caps it at 1000). SET LOCAL ends with this transaction.
+        ef_search = min(1000, max(self.hnsw_ef_search, 2 * max(scan_limits)))
+        settings = ["SET LOCAL hnsw.ef_search = %s"]
+        if filtered:
+            # A selective filter can reject most of those ef_search rows, leaving fewer than
+            # LIMIT (or none) although matching chunks exist. Iterative scans keep walking the
+            # graph until enough rows pass (relaxed_order is fine, rows are re-sorted below);
+            # without them only an exact scan is complete.
+            if self._pgvector_version >= ITERATIVE_SCAN_MIN_VERSION:
+                settings.append("SET LOCAL hnsw.iterative_scan = relaxed_order")
+            else:
+                settings.append("SET LOCAL enable_indexscan = off")
+        
+        try:
+            cursor.execute(";\n".join(settings), (ef_search,))
+            cursor.execute(full_query, params)
+            results = cursor.fetchall()
+            
+            search_results: List[List[SearchResult]] = [[] for _ in searches]
+            for row in results:
+                # The threshold is applied here rather than in SQL so it cannot block index use
+                if row['similarity_score'] < (searches[row['query_index']].get("similarity_threshold") or 0.0):
+                    continue
+                
+                metadata = {}
+                # Metadata columns are already parsed as dict by RealDictCursor
+                if row['chunk_metadata']:
+                    metadata.update(row['chunk_metadata'])
+                if row['doc_metadata']:
+                    metadata.update(row['doc_metadata'])
+                
+                search_results[row['query_index']].append(SearchResult(
+                    content=row['content'],
+                    doc_id=row['doc_id'],
+                    chunk_id=row['chunk_id'],
+                    filename=row['filename'],
+                    organization=row['organization'],
+                    doc_type=row['doc_type'],
+                    similarity_score=row['similarity_score'],
+                    metadata=metadata,
+                    token_count=row['token_count']
+                ))
+            
+            # UNION ALL does not preserve block order, so re-sort each search's rows
+            for result_list in search_results:
+                result_list.sort(key=lambda result: result.similarity_score, reverse=True)
+            
+            return search_results
+            
+        except Exception as e:
+            print(f"Error searching chunks: {e}")
+            self._embedding_storage = None
+            print(f"Query: {full_query}")
+            print(f"Searches: {len(searches)}")  # Don't print the embedding vectors
+            return [FailedSearch(f"Error searching chunks: {e}") for _ in searches]
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def prepare_context(self, search_results: List[SearchResult], max_tokens: int = 3000) -> str:
+        """
+        Prepare context string from search results, respecting token limits
+        """
+        if not search_results:
+            return "No relevant information found."
+        
+        separator = "\n---\n"
+        separator_tokens = len(self.encoding.encode(separator))
+        source_infos = [f"[Source: {result.filename} - {result.organization}]" for result in search_results]
+        
+        # Chunk bodies were token-counted at ingest; only the short headers are encoded here.
+        # encode_batch would start a thread pool per call, which costs more than these few strings
+        header_tokens = [len(self.encoding.encode(source_info)) for source_info in source_infos]
+        content_tokens = [
+            result.token_count if result.token_count is not None else len(self.encoding.encode(result.content))
+            for result in search_results
+        ]
+        
+        # Keep the longest prefix of results whose running token total fits the budget
+        entry_tokens = np.array(header_tokens, dtype=np.int64) + np.array(content_tokens, dtype=np.int64) + separator_tokens
+        cut = int(np.searchsorted(np.cumsum(entry_tokens), max_tokens, side='right'))
+        
+        return separator.join(
+            f"{source_info}\n{result.content}\n"
+            for source_info, result in zip(source_infos[:cut], search_results[:cut])
+        )
+    
+    def build_messages(self, question: str, context: str) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for a question and its retrieved context
+        """
+        # Load the RAG prompt template
+        try:
+            with open('rag_prompt.md', 'r') as f:
+                prompt_template = f.read()
+        except FileNotFoundError:
+            prompt_template = """You are an expert marine scientist and ocean sustainability specialist. Answer the user's question based on the provided context from ocean research documents.
+
+Guidelines:
+- Use only information from the provided context
+- Be specific and cite sources when possible
+- If the context doesn't contain relevant information, say so
+- Focus on ocean sustainability, marine ecosystems, and environmental impacts
+- Provide practical insights when available
+
+Context:
+{context}
+
+Question: {question}
+
+Answer:"""
+        
+        # Format the prompt
+        formatted_prompt = prompt_template.format(context=context, question=question)
+        
+        return [
+            {"role": "system", "content": "You are an expert marine scientist and ocean sustainability specialist."},
+            {"role": "user", "content": formatted_prompt}
+        ]
+    
+    def generate_response(self, question: str, context: str) -> Dict[str, Any]:
+        """
+        Generate response using OpenAI chat model with context
+        """
+        try:
+            response = self.openai_client.chat.completions.create(
+                model=self.chat_model,
+                messages=self.build_messages(question, context),
+                temperature=0.7,
+                max_tokens=1000
+            )
+            
+            return {
+                "answer": response.choices[0].message.content,
+                "model": self.chat_model,
+                "usage": response.usage.dict() if response.usage else {}
+            }
+            
+        except Exception as e:
+            return {
+                "answer": f"Error generating response: {e}",
+                "model": self.chat_model,
+                "usage": {},
+                "error": str(e)
+            }
+    
+    def generate_response_stream(self, question: str, context: str) -> Generator[str, None, Dict[str, Any]]:
+        """
+        Stream the response of the chat model as text deltas
+        
+        Yields:
+            Pieces of the answer as they arrive
+        
+        Returns:
+            The same dictionary as generate_response, once the stream is exhausted
+        """
+        parts = []
+        usage = {}
+        error = None
+        try:
+            stream = self.openai_client.chat.completions.create(
+                model=self.chat_model,
+                messages=self.build_messages(question, context),
+                temperature=0.7,
+                max_tokens=1000,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            
+            for chunk in stream:
+                # The final chunk carries the usage and no choices
+                if chunk.usage:
+                    usage = chunk.usage.dict()
+                if chunk.choices and chunk.choices[0].delta.content:
+                    delta = chunk.choices[0].delta.content
+                    parts.append(delta)
+                    yield delta
+            
+        except Exception as e:
+            error = str(e)
+            message = f"Error generating response: {e}"
+            parts.append(message)
+            yield message
+        
+        response_data = {
+            "answer": "".join(parts),
+            "model": self.chat_model,
+            "usage": usage
+        }
+        if error is not None:
+            response_data["error"] = error
+        return response_data
+    
+    def answer(self,
+               question: str,
+               search_results: List[SearchResult],
+               doc_type_filter: Optional[str] = None,
+               geographic_filter: Optional[str] = None,
+               topic_filter: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate the answer for already retrieved search results
+        
+        Returns:
+            Dictionary containing answer, sources, and metadata
+        """
+        # Prepare context
+        context = self.prepare_context(search_results)
+        
+        # Generate response
+        response_data = self.generate_response(question, context)
+        
+        return self.build_result(question, search_results, context, response_data,
+                                 doc_type_filter, geographic_filter, topic_filter)
+    
+    def answer_stream(self,
+                      question: str,
+                      search_results: List[SearchResult],
+                      doc_type_filter: Optional[str] = None,
+                      geographic_filter: Optional[str] = None,
+                      topic_filter: Optional[str] = None) -> Generator[str, None, Dict[str, Any]]:
+        """
+        Streaming variant of answer(): yields answer text deltas and returns the result dictionary
+        """
+        context = self.prepare_context(search_results)
+        response_data = yield from self.generate_response_stream(question, context)
+        
+        return self.build_result(question, search_results, context, response_data,
+                                 doc_type_filter, geographic_filter, topic_filter)
+    
+    def build_result(self,
+                     question: str,
+                     search_results: List[SearchResult],
+                     context: str,
+                     response_data: Dict[str, Any],
+                     doc_type_filter: Optional[str] = None,
+                     geographic_filter: Optional[str] = None,
+                     topic_filter: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Assemble the answer, sources, and metadata returned to callers
+        """
+        # Prepare source information
+        sources = []
+        for result in search_results:
+            sources.append({
+                "filename": result.filename,
+                "organization": result.organization,
+                "doc_type": result.doc_type,
+                "similarity_score": round(result.similarity_score, 3),
+                "geographic_focus": result.metadata.get('geographic_focus'),
+                "topics": result.metadata.get('topics', [])
+            })
+        
+        result = {
+            "answer": response_data["answer"],
+            "sources": sources,
+            "context": context,
+            "metadata": {
+                "question": question,
+                "results_count": len(search_results),
+                "model_usage": response_data.get("usage", {}),
+                "filters_applied": {
+                    "doc_type": doc_type_filter,
+                    "geographic": geographic_filter,
+                    "topic": topic_filter
+                }
+            }
+        }
+        # A failed search or chat call is transient; flag it so the answer is not cached
+        error = getattr(search_results, "error", None) or response_data.get("error")
+        if error:
+            result["metadata"]["error"] = error
+        return result
+    
+    def query(self, 
+              question: str,
+              max_results: int = 5,
+              similarity_threshold: float = 0.0,
+              doc_type_filter: Optional[str] = None,
+              geographic_filter: Optional[str] = None,
+              topic_filter: Optional[str] = None,
+              query_embedding: Optional[List[float]] = None) -> Dict[str, Any]:
+        """
+        Main query method that orchestrates the RAG pipeline
+        
+        Args:
+            query_embedding: Precomputed embedding of the question, created if omitted
+        
+        Returns:
+            Dictionary containing answer, sources, and metadata
+        """
+        # Create embedding for the question
+        if query_embedding is None:
+            query_embedding = self.create_query_embedding(question)
+        if query_embedding is None or len(query_embedding) == 0:
+            return embedding_error_result()
+        
+        # Search for similar chunks
+        search_results = self.search_similar_chunks(
+            query_embedding=query_embedding,
+            limit=max_results,
+            similarity_threshold=similarity_threshold,
+            doc_type_filter=doc_type_filter,
+            geographic_filter=geographic_filter,
+            topic_filter=topic_filter
+        )
+        
+        return self.answer(question, search_results, doc_type_filter, geographic_filter, topic_filter)
+    
+    def query_stream(self, 
+                     question: str,
+                     max_results: int = 5,
+                     similarity_threshold: float = 0.0,
+                     doc_type_filter: Optional[str] = None,
+                     geographic_filter: Optional[str] = None,
+                     topic_filter: Optional[str] = None,
+                     query_embedding: Optional[List[float]] = None) -> Generator[str, None, Dict[str, Any]]:
+        """
+        Streaming variant of query()
+        
+        Yields:
+            Pieces of the answer as the chat model produces them
+        
+        Returns:
+            Dictionary containing answer, sources, and metadata (the generator's return value)
+        """
+        if query_embedding is None:
+            query_embedding = self.create_query_embedding(question)
+        if query_embedding is None or len(query_embedding) == 0:
+            result = embedding_error_result()
+            yield result["answer"]
+            return result
+        
+        search_results = self.search_similar_chunks(
+            query_embedding=query_embedding,
+            limit=max_results,
+            similarity_threshold=similarity_threshold,
+            doc_type_filter=doc_type_filter,
+            geographic_filter=geographic_filter,
+            topic_filter=topic_filter
+        )
+        
+        return (yield from self.answer_stream(question, search_results, doc_type_filter, geographic_filter, topic_filter))
+
+class QueryProcessor:
+    """
+    Coalesces concurrent queries into batches: the questions of a batch are embedded
+    with one API call and searched with one SQL statement, then each caller generates
+    its own answer.
+    """
+    
+    def __init__(self, retriever: OceanRAGRetriever, batch_size: int = 16, max_wait_ms: float = 50):
+        """
+        Start the background event loop that drains the query queue
+        
+        Args:
+            retriever: Retriever used for embedding, search and answer generation
+            batch_size: Maximum number of queries per batch
+            max_wait_ms: How long the first query of a batch waits for others to join
+        """
+        self.retriever = retriever
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="query-processor", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+    
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._loop.create_task(self._drain())
+        self._ready.set()
+        self._loop.run_forever()
+    
+    async def submit(self, question: str, query_embedding: Optional[List[float]] = None,
+                     **search_params) -> Optional[List[SearchResult]]:
+        """
+        Queue a question for batched retrieval
+        
+        Args:
+            question: The question to embed (unless query_embedding is given)
+            query_embedding: Precomputed embedding of the question
+            search_params: Keyword arguments for search_similar_chunks (limit, filters, ...)
+        
+        Returns:
+            The search results, or None if the question could not be embedded
+        """
+        future = self._loop.create_future()
+        await self._queue.put((question, query_embedding, search_params, future))
+        return await future
+    
+    async def _drain(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Blocking API/DB work runs off the loop so the next batch can fill meanwhile
+            try:
+                results = await self._loop.run_in_executor(None, self._retrieve_batch, batch)
+            except Exception as e:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (*_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+    
+    def _retrieve_batch(self, batch: list) -> List[Optional[List[SearchResult]]]:
+        """Embed and search a drained batch"""
+        embeddings = [query_embedding for _, query_embedding, _, _ in batch]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            created = self.retriever.create_query_embeddings([batch[i][0] for i in missing])
+            for i, embedding in zip(missing, created):
+                embeddings[i] = embedding
+        
+        searchable = [i for i, embedding in enumerate(embeddings)
+                      if embedding is not None and len(embedding) > 0]
+        search_results = self.retriever.search_similar_chunks_batch([
+            {"query_embedding": embeddings[i], **batch[i][2]} for i in searchable
+        ])
+        
+        results: List[Optional[List[SearchResult]]] = [None] * len(batch)
+        for i, result_list in zip(searchable, search_results):
+            results[i] = result_list
+        return results
+    
+    def retrieve(self, question: str, query_embedding: Optional[List[float]] = None,
+                 **search_params) -> Optional[List[SearchResult]]:
+        """Blocking wrapper around submit() for use from synchronous code"""
+        future = asyncio.run_coroutine_threadsafe(
+            self.submit(question, query_embedding, **search_params), self._loop
+        )
+        return future.result()
+    
+    def query(self, 
+              question: str,
+              max_results: int = 5,
+              similarity_threshold: float = 0.0,
+              doc_type_filter: Optional[str] = None,
+              geographic_filter: Optional[str] = None,
+              topic_filter: Optional[str] = None,
+              query_embedding: Optional[List[float]] = None) -> Dict[str, Any]:
+        """Same as OceanRAGRetriever.query, but retrieval is batched with concurrent callers"""
+        search_results = self.retrieve(
+            question,
+            query_embedding,
+            limit=max_results,
+            similarity_threshold=similarity_threshold,
+            doc_type_filter=doc_type_filter,
+            geographic_filter=geographic_filter,
+            topic_filter=topic_filter
+        )
+        if search_results is None:
+            return embedding_error_result()
+        
+        return self.retriever.answer(question, search_results, doc_type_filter, geographic_filter, topic_filter)
+    
+    def query_stream(self, 
+                     question: str,
+                     max_results: int = 5,
+                     similarity_threshold: float = 0.0,
+                     doc_type_filter: Optional[str] = None,
+                     geographic_filter: Optional[str] = None,
+                     topic_filter: Optional[str] = None,
+                     query_embedding: Optional[List[float]] = None) -> Generator[str, None, Dict[str, Any]]:
+        """Same as OceanRAGRetriever.query_stream, but retrieval is batched with concurrent callers"""
+        search_results = self.retrieve(
+            question,
+            query_embedding,
+            limit=max_results,
+            similarity_threshold=similarity_threshold,
+            doc_type_filter=doc_type_filter,
+            geographic_filter=geographic_filter,
+            topic_filter=topic_filter
+        )
+        if search_results is None:
+            result = embedding_error_result()
+            yield result["answer"]
+            return result
+        
+        return (yield from self.retriever.answer_stream(question, search_results, doc_type_filter, geographic_filter, topic_filter))
+
+def main():
+    """Test the RAG retriever with a sample query"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Test Ocean RAG Retriever")
+    parser.add_argument("--question", "-q", required=True, help="Question to ask")
+    parser.add_argument("--config", "-c", default="config.yaml", help="Configuration file")
+    parser.add_argument("--max-results", type=int, default=5, help="Maximum results to retrieve")
+    parser.add_argument("--doc-type", help="Filter by document type")
+    parser.add_argument("--geographic", help="Filter by geographic region")
+    parser.add_argument("--topic", help="Filter by topic label (e.g. seagrass_restoration)")
+    
+    args = parser.parse_args()
+    
+    retriever = OceanRAGRetriever(args.config)
+    
+    result = retriever.query(
+        question=args.question,
+        max_results=args.max_results,
+        doc_type_filter=args.doc_type,
+        geographic_filter=args.geographic,
+        topic_filter=args.topic
+    )
+    
+    print(f"Question: {result['metadata']['question']}")
+    print(f"\nAnswer: {result['answer']}")
+    print(f"\nSources ({len(result['sources'])}):")
+    for i, source in enumerate(result['sources'], 1):
+        print(f"  {i}. {source['filename']} ({source['organization']}) - Similarity: {source['similarity_score']}")
+    
+    print(f"\nResults found: {result['metadata']['results_count']}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
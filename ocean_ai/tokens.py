@@ -0,0 +1,13 @@
+"""
+Tokenizer Access for Ocean AI POC
+Process-wide tiktoken encodings shared by ingestion and retrieval.
+"""
+
+from functools import lru_cache
+
+import tiktoken
+
+@lru_cache(maxsize=4)
+def get_encoding(name: str = "cl100k_base") -> tiktoken.Encoding:
+    """Return the tiktoken encoding, loading its BPE ranks only once per process"""
+    return tiktoken.get_encoding(name)
@@ -4,14 +4,8 @@ Reset Database Tables
 Drops existing tables and recreates the schema from scratch.
 """
 
-import yaml
-import psycopg2
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-
-def load_config():
-    """Load configuration from config.yaml"""
-    with open('config.yaml', 'r') as f:
-        return yaml.safe_load(f)
+from ocean_ai.config import load_config
+from ocean_ai.db import cursor
 
 def reset_tables():
     """Drop existing tables and recreate schema"""
@@ -21,35 +15,26 @@ def reset_tables():
         
         print(f"🔄 Resetting tables in database: {db_config['dbname']}")
         
-        # Connect to database
-        conn = psycopg2.connect(
-            host=db_config['host'],
-            port=db_config['port'],
-            dbname=db_config['dbname'],
-            user=db_config['user'],
-            password=db_config['password'],
-            sslmode=db_config['sslmode']
-        )
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-        cursor = conn.cursor()
-        
-        # Drop tables in correct order (chunks first due to foreign key)
-        print("🗑️  Dropping existing tables...")
-        cursor.execute("DROP TABLE IF EXISTS chunks CASCADE;")
-        print("   ✅ Dropped chunks table")
-        
-        cursor.execute("DROP TABLE IF EXISTS documents CASCADE;")
-        print("   ✅ Dropped documents table")
-        
-        # Drop any existing indexes that might remain
-        cursor.execute("DROP INDEX IF EXISTS chunks_embedding_idx;")
-        cursor.execute("DROP INDEX IF EXISTS idx_documents_doc_type;")
-        cursor.execute("DROP INDEX IF EXISTS idx_documents_organization;")
-        cursor.execute("DROP INDEX IF EXISTS idx_chunks_doc_id;")
-        print("   ✅ Dropped indexes")
-        
-        cursor.close()
-        conn.close()
+        # Borrow a pooled connection; DROP statements run in autocommit mode
+        with cursor(autocommit=True) as cur:
+            # Drop tables in correct order (chunks first due to foreign key), then any
+            # indexes that might remain, all in one round trip
+            print("🗑️  Dropping existing tables...")
+            cur.execute("""
+                DROP TABLE IF EXISTS chunks CASCADE;
+                DROP TABLE IF EXISTS documents CASCADE;
+                DROP INDEX IF EXISTS chunks_embedding_idx;
+                DROP INDEX IF EXISTS chunks_embedding_hnsw_idx;
+                DROP INDEX IF EXISTS chunks_embedding_bin_idx;
+                DROP INDEX IF EXISTS idx_documents_doc_type;
+                DROP INDEX IF EXISTS idx_documents_organization;
+                DROP INDEX IF EXISTS idx_documents_filename_file_size;
+                DROP INDEX IF EXISTS idx_chunks_doc_id;
+                DROP INDEX IF EXISTS idx_chunks_content_sha256;
+            """)
+            print("   ✅ Dropped chunks table")
+            print("   ✅ Dropped documents table")
+            print("   ✅ Dropped indexes")
         
         print("🏗️  Running database setup to recreate tables...")
         